@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
-"""Generate exploratory figures for the Population Growth dataset."""
+"""Generate exploratory figures for the Population Growth dataset.
+
+Figures are described as plain-data specs and rendered by figure_render.py,
+one process per figure (--workers).
+"""
 
 from __future__ import annotations
 
+import argparse
 import csv
 from collections import defaultdict
 from pathlib import Path
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from figure_render import op, render_all
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CLEAN_DATA = PROJECT_ROOT / "data" / "cleaned_growth_data.csv"
@@ -61,85 +63,118 @@ def select_example_curve_ids(summary_rows: list[dict[str, str]], limit: int = 12
     return chosen_ids
 
 
-def make_observation_count_figure(summary_rows: list[dict[str, str]]) -> None:
+def observation_count_spec(summary_rows: list[dict[str, str]]) -> dict:
     counts = [int(row["NObservations"]) for row in summary_rows]
-    plt.figure(figsize=(8, 5))
-    plt.hist(counts, bins=20, color="#3b82f6", edgecolor="white")
-    plt.xlabel("Observations per curve")
-    plt.ylabel("Number of curves")
-    plt.title("Population Growth curve sizes")
-    plt.tight_layout()
-    plt.savefig(OBSERVATION_COUNTS_FIGURE, dpi=200)
-    plt.close()
-
-
-def make_raw_curve_grid_figure(
+    return {
+        "path": str(OBSERVATION_COUNTS_FIGURE),
+        "figsize": (8, 5),
+        "dpi": 200,
+        "axes": [
+            [
+                op("hist", counts, bins=20, color="#3b82f6", edgecolor="white"),
+                op("set_xlabel", "Observations per curve"),
+                op("set_ylabel", "Number of curves"),
+                op("set_title", "Population Growth curve sizes"),
+            ]
+        ],
+    }
+
+
+def raw_curve_grid_spec(
     summary_rows: list[dict[str, str]],
     grouped_points: dict[str, list[tuple[float, float]]],
-) -> list[str]:
-    chosen_ids = select_example_curve_ids(summary_rows, limit=12)
+    chosen_ids: list[str],
+) -> dict:
     chosen_lookup = {row["CurveID"]: row for row in summary_rows}
 
-    fig, axes = plt.subplots(3, 4, figsize=(14, 10), sharex=False, sharey=False)
-    for axis, curve_id in zip(axes.flatten(), chosen_ids):
+    axes = []
+    for curve_id in chosen_ids:
         points = grouped_points[curve_id]
         times = [point[0] for point in points]
         popbio = [point[1] for point in points]
         metadata = chosen_lookup[curve_id]
 
-        axis.plot(times, popbio, color="#0f766e", linewidth=1.5)
-        axis.scatter(times, popbio, color="#0f766e", s=12)
-        axis.set_title(
-            f"{curve_id}: {metadata['Species']} @ {float(metadata['Temp']):.0f}C",
-            fontsize=8,
+        axes.append(
+            [
+                op("plot", times, popbio, color="#0f766e", linewidth=1.5),
+                op("scatter", times, popbio, color="#0f766e", s=12),
+                op(
+                    "set_title",
+                    f"{curve_id}: {metadata['Species']} @ {float(metadata['Temp']):.0f}C",
+                    fontsize=8,
+                ),
+                op("set_xlabel", "Time"),
+                op("set_ylabel", "PopBio"),
+            ]
         )
-        axis.set_xlabel("Time")
-        axis.set_ylabel("PopBio")
-
-    for axis in axes.flatten()[len(chosen_ids) :]:
-        axis.axis("off")
 
-    fig.suptitle("Raw Population Growth curve examples", fontsize=14)
-    fig.tight_layout()
-    fig.savefig(RAW_CURVE_GRID_FIGURE, dpi=200)
-    plt.close(fig)
+    for _ in range(len(chosen_ids), 12):
+        axes.append([op("axis", "off")])
 
-    return chosen_ids
+    return {
+        "path": str(RAW_CURVE_GRID_FIGURE),
+        "figsize": (14, 10),
+        "grid": (3, 4),
+        "dpi": 200,
+        "axes": axes,
+        "figure": [op("suptitle", "Raw Population Growth curve examples", fontsize=14)],
+    }
 
 
-def make_best_curve_figure(
-    summary_rows: list[dict[str, str]],
+def best_curve_spec(
+    best_curve: dict[str, str],
     grouped_points: dict[str, list[tuple[float, float]]],
-) -> dict[str, str]:
-    best_curve = summary_rows[0]
+) -> dict:
     curve_id = best_curve["CurveID"]
     points = grouped_points[curve_id]
     times = [point[0] for point in points]
     popbio = [point[1] for point in points]
 
-    plt.figure(figsize=(8, 5))
-    plt.plot(times, popbio, color="#b91c1c", linewidth=1.8)
-    plt.scatter(times, popbio, color="#b91c1c", s=16)
-    plt.xlabel(f"Time ({best_curve['TimeUnits']})")
-    plt.ylabel(f"PopBio ({best_curve['PopBioUnits']})")
-    plt.title(f"Selected nonlinear fitting candidate: {curve_id}")
-    plt.tight_layout()
-    plt.savefig(BEST_CURVE_FIGURE, dpi=200)
-    plt.close()
-
-    return best_curve
+    return {
+        "path": str(BEST_CURVE_FIGURE),
+        "figsize": (8, 5),
+        "dpi": 200,
+        "axes": [
+            [
+                op("plot", times, popbio, color="#b91c1c", linewidth=1.8),
+                op("scatter", times, popbio, color="#b91c1c", s=16),
+                op("set_xlabel", f"Time ({best_curve['TimeUnits']})"),
+                op("set_ylabel", f"PopBio ({best_curve['PopBioUnits']})"),
+                op("set_title", f"Selected nonlinear fitting candidate: {curve_id}"),
+            ]
+        ],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate exploratory Population Growth figures.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Figure rendering processes (default: one per figure, at most one per CPU; 1 renders in-process).",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
     if not CLEAN_DATA.exists() or not SUMMARY_TABLE.exists():
         raise FileNotFoundError("Run 01_data_prep.py before generating exploratory plots.")
 
+    args = parse_args()
     summary_rows = load_curve_summary()
     grouped_points = load_curve_points()
 
-    make_observation_count_figure(summary_rows)
-    chosen_ids = make_raw_curve_grid_figure(summary_rows, grouped_points)
-    best_curve = make_best_curve_figure(summary_rows, grouped_points)
+    chosen_ids = select_example_curve_ids(summary_rows, limit=12)
+    best_curve = summary_rows[0]
+    render_results = render_all(
+        [
+            observation_count_spec(summary_rows),
+            raw_curve_grid_spec(summary_rows, grouped_points, chosen_ids),
+            best_curve_spec(best_curve, grouped_points),
+        ],
+        args.workers,
+    )
 
     report_lines = [
         "Population Growth exploratory plotting summary",
@@ -150,9 +185,8 @@ def main() -> None:
     ]
     PLOT_REPORT.write_text("\n".join(report_lines) + "\n", encoding="utf-8")
 
-    print(f"Wrote {OBSERVATION_COUNTS_FIGURE}")
-    print(f"Wrote {RAW_CURVE_GRID_FIGURE}")
-    print(f"Wrote {BEST_CURVE_FIGURE}")
+    for result in render_results:
+        print(f"Wrote {result['path']} ({result['seconds']:.2f}s)")
     print(f"Wrote {PLOT_REPORT}")
 
 
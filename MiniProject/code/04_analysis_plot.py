@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
-"""Summarize model-fitting results and produce core afternoon figures."""
+"""Summarize model-fitting results and produce core afternoon figures.
+
+Figures are described as plain-data specs and rendered by figure_render.py,
+one process per figure (--workers).
+"""
 
 from __future__ import annotations
 
+import argparse
 import csv
 from collections import Counter, defaultdict
 from pathlib import Path
 from statistics import mean
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from figure_render import op, render_all
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 TABLES_DIR = PROJECT_ROOT / "results" / "tables"
@@ -33,46 +35,52 @@ def read_csv(path: Path) -> list[dict[str, str]]:
         return list(csv.DictReader(handle))
 
 
-def make_model_win_figure(best_rows: list[dict[str, str]]) -> Counter:
-    wins = Counter(row["BestModel"] for row in best_rows)
+def model_win_spec(wins: Counter) -> dict:
     models = ["Quadratic", "Cubic", "Gompertz"]
     counts = [wins.get(model, 0) for model in models]
 
-    plt.figure(figsize=(8, 5))
-    plt.bar(models, counts, color=["#94a3b8", "#0ea5e9", "#ef4444"])
-    plt.ylabel("Curves won by lowest AIC")
-    plt.title("Best model counts across Population Growth curves")
-    plt.tight_layout()
-    plt.savefig(MODEL_WIN_FIGURE, dpi=200)
-    plt.close()
-
-    return wins
+    return {
+        "path": str(MODEL_WIN_FIGURE),
+        "figsize": (8, 5),
+        "dpi": 200,
+        "axes": [
+            [
+                op("bar", models, counts, color=["#94a3b8", "#0ea5e9", "#ef4444"]),
+                op("set_ylabel", "Curves won by lowest AIC"),
+                op("set_title", "Best model counts across Population Growth curves"),
+            ]
+        ],
+    }
 
 
-def make_aic_distribution_figure(metric_rows: list[dict[str, str]]) -> dict[str, list[float]]:
+def group_aic(metric_rows: list[dict[str, str]]) -> dict[str, list[float]]:
     grouped_aic: dict[str, list[float]] = defaultdict(list)
     for row in metric_rows:
         if row["FitStatus"] == "success" and row["AIC"] not in {"", "NA", "NaN"}:
             grouped_aic[row["Model"]].append(float(row["AIC"]))
 
+    return grouped_aic
+
+
+def aic_distribution_spec(grouped_aic: dict[str, list[float]]) -> dict:
     models = ["Quadratic", "Cubic", "Gompertz"]
     data = [grouped_aic.get(model, []) for model in models]
 
-    plt.figure(figsize=(8, 5))
-    plt.boxplot(data, tick_labels=models)
-    plt.ylabel("AIC")
-    plt.title("AIC distribution for successful model fits")
-    plt.tight_layout()
-    plt.savefig(AIC_FIGURE, dpi=200)
-    plt.close()
-
-    return grouped_aic
+    return {
+        "path": str(AIC_FIGURE),
+        "figsize": (8, 5),
+        "dpi": 200,
+        "axes": [
+            [
+                op("boxplot", data, tick_labels=models),
+                op("set_ylabel", "AIC"),
+                op("set_title", "AIC distribution for successful model fits"),
+            ]
+        ],
+    }
 
 
-def make_best_curve_figure(
-    best_rows: list[dict[str, str]],
-    prediction_rows: list[dict[str, str]],
-) -> str:
+def select_best_curve_row(best_rows: list[dict[str, str]]) -> dict[str, str] | None:
     preferred_curve_id = ""
     if PREP_REPORT_PATH.exists():
         for line in PREP_REPORT_PATH.read_text(encoding="utf-8").splitlines():
@@ -101,10 +109,11 @@ def make_best_curve_figure(
 
     if best_curve_row is None and best_rows:
         best_curve_row = best_rows[0]
-    if best_curve_row is None:
-        return ""
 
-    curve_id = best_curve_row["CurveID"]
+    return best_curve_row
+
+
+def best_curve_spec(curve_id: str, prediction_rows: list[dict[str, str]]) -> dict:
     grouped_predictions: dict[str, list[tuple[float, float, float]]] = defaultdict(list)
     observed_points = []
 
@@ -117,15 +126,17 @@ def make_best_curve_figure(
         observed_points.append((time_value, observed_log))
         grouped_predictions[row["Model"]].append((time_value, observed_log, fitted_log))
 
-    plt.figure(figsize=(8, 5))
     observed_points = sorted(set(observed_points), key=lambda item: item[0])
-    plt.scatter(
-        [point[0] for point in observed_points],
-        [point[1] for point in observed_points],
-        color="black",
-        s=20,
-        label="Observed log10(PopBio)",
-    )
+    ops = [
+        op(
+            "scatter",
+            [point[0] for point in observed_points],
+            [point[1] for point in observed_points],
+            color="black",
+            s=20,
+            label="Observed log10(PopBio)",
+        )
+    ]
 
     colors = {
         "Quadratic": "#94a3b8",
@@ -136,23 +147,24 @@ def make_best_curve_figure(
         rows = sorted(grouped_predictions.get(model_name, []), key=lambda item: item[0])
         if not rows:
             continue
-        plt.plot(
-            [item[0] for item in rows],
-            [item[2] for item in rows],
-            linewidth=2,
-            color=colors[model_name],
-            label=model_name,
+        ops.append(
+            op(
+                "plot",
+                [item[0] for item in rows],
+                [item[2] for item in rows],
+                linewidth=2,
+                color=colors[model_name],
+                label=model_name,
+            )
         )
 
-    plt.xlabel("Time")
-    plt.ylabel("log10(PopBio)")
-    plt.title(f"Model fits for example curve {curve_id}")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(BEST_CURVE_FIGURE, dpi=200)
-    plt.close()
-
-    return curve_id
+    ops += [
+        op("set_xlabel", "Time"),
+        op("set_ylabel", "log10(PopBio)"),
+        op("set_title", f"Model fits for example curve {curve_id}"),
+        op("legend"),
+    ]
+    return {"path": str(BEST_CURVE_FIGURE), "figsize": (8, 5), "dpi": 200, "axes": [ops]}
 
 
 def write_summary(
@@ -188,22 +200,39 @@ def write_summary(
     AFTERNOON_REPORT_PATH.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Summarize model fits and produce the analysis figures.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Figure rendering processes (default: one per figure, at most one per CPU; 1 renders in-process).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
     if not (METRICS_PATH.exists() and PREDICTIONS_PATH.exists() and BEST_MODEL_PATH.exists()):
         raise FileNotFoundError("Run 03_model_fit.R before generating the analysis figures.")
 
+    args = parse_args()
     metric_rows = read_csv(METRICS_PATH)
     prediction_rows = read_csv(PREDICTIONS_PATH)
     best_rows = read_csv(BEST_MODEL_PATH)
 
-    wins = make_model_win_figure(best_rows)
-    grouped_aic = make_aic_distribution_figure(metric_rows)
-    best_curve_id = make_best_curve_figure(best_rows, prediction_rows)
+    wins = Counter(row["BestModel"] for row in best_rows)
+    grouped_aic = group_aic(metric_rows)
+    best_curve_row = select_best_curve_row(best_rows)
+    best_curve_id = best_curve_row["CurveID"] if best_curve_row is not None else ""
+
+    specs = [model_win_spec(wins), aic_distribution_spec(grouped_aic)]
+    if best_curve_id:
+        specs.append(best_curve_spec(best_curve_id, prediction_rows))
+    render_results = render_all(specs, args.workers)
     write_summary(metric_rows, best_rows, wins, grouped_aic, best_curve_id)
 
-    print(f"Wrote {MODEL_WIN_FIGURE}")
-    print(f"Wrote {AIC_FIGURE}")
-    print(f"Wrote {BEST_CURVE_FIGURE}")
+    for result in render_results:
+        print(f"Wrote {result['path']} ({result['seconds']:.2f}s)")
     print(f"Wrote {AFTERNOON_REPORT_PATH}")
 
 
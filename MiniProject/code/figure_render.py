@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Render MiniProject figures from plain-data specs, optionally in a process pool.
+
+A spec holds only data and layout, so it can be pickled to worker processes:
+
+    {"path": ".../figure.png", "figsize": (8, 5), "grid": (1, 1), "dpi": 200,
+     "axes": [[op("plot", x, y), op("set_xlabel", "Time")]],
+     "figure": [op("suptitle", "...")]}
+
+Each op is an Axes method call (name, args, kwargs), one list per subplot in
+row-major order; "figure" ops are Figure method calls.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+
+def op(name: str, *args: Any, **kwargs: Any) -> tuple[str, tuple, dict]:
+    return (name, args, kwargs)
+
+
+def render(spec: dict) -> dict:
+    """Draw and save one figure spec; return {"path", "seconds"}."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    fig, axes = plt.subplots(*spec.get("grid", (1, 1)), figsize=spec.get("figsize"), squeeze=False)
+    for ax, ops in zip(axes.flat, spec.get("axes", [])):
+        for name, args, kwargs in ops:
+            getattr(ax, name)(*args, **kwargs)
+    for name, args, kwargs in spec.get("figure", []):
+        getattr(fig, name)(*args, **kwargs)
+    fig.tight_layout()
+
+    path = Path(spec["path"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, dpi=spec.get("dpi", "figure"))
+    plt.close(fig)
+    return {"path": str(path), "seconds": time.perf_counter() - start}
+
+
+def render_all(specs: list[dict], workers: int | None = None) -> list[dict]:
+    """Render specs in input order; workers defaults to min(len(specs), CPU count), 1 = in-process."""
+    if workers is None:
+        workers = min(len(specs), os.cpu_count() or 1)
+    if workers <= 1:
+        return [render(spec) for spec in specs]
+    with ProcessPoolExecutor(min(workers, len(specs))) as executor:
+        return list(executor.map(render, specs))
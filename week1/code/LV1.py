@@ -6,14 +6,27 @@ Generates two PDF figures (time series & phase-plane) in ../results/ without sho
 Model (as in the notes):
     dR/dt = r*R - a*C*R
     dC/dt = -z*C + e*a*C*R
+
+The RHS and its analytic Jacobian write into preallocated buffers and are
+passed to odeint as func/Dfun; solver statistics (nfe, nje, steps) are printed
+and can be written as JSON with --stats-json.
+
+--orbits N integrates N initial conditions in a single odeint call: the state
+is [R_0, C_0, R_1, C_1, ...], so the Jacobian is block-diagonal (2x2 blocks) and
+is handed to odeint in banded form (ml = mu = 1). All orbits are drawn into one
+phase-plane figure with a single LineCollection.
+
+--no-plot only integrates (matplotlib is never imported); --max-points and
+--raster bound the size of the PDFs for fine grids (see LVplot).
 """
 
+import argparse, json, time
 from pathlib import Path
-import numpy as np
-import scipy.integrate as integrate
-import matplotlib
-matplotlib.use("Agg")  # ensure no GUI backend is needed
-import matplotlib.pyplot as plt
+import LVtiming
+with LVtiming.phase("import"):
+    import numpy as np
+    import scipy.integrate as integrate
+    import LVplot, LVrender, LVstore  # matplotlib itself is imported only when a figure is made
 
 # -----------------------
 # Parameters & ICs
@@ -30,55 +43,184 @@ t0, tmax, dt = 0.0, 60.0, 0.01
 OUT_DIR = Path(__file__).resolve().parents[1] / "results"
 FIG1 = OUT_DIR / "LV_model_timeseries.pdf"
 FIG2 = OUT_DIR / "LV_model_phaseplane.pdf"
+FIG3 = OUT_DIR / "LV_model_orbits.pdf"
 
 # -----------------------
 # ODE system
 # -----------------------
-def dCR_dt(pop, t=0.0):
+# odeint copies what func/Dfun return, so both reuse one buffer per process.
+# Callers that keep the result of rhs()/jac() must copy it; dCR_dt() returns a new array.
+_dpop = np.empty(2)
+_jac = np.empty((2, 2))
+
+def rhs(pop, t, r, a, z, e):
+    R, C = pop
+    aCR = a*C*R
+    _dpop[0] = r*R - aCR
+    _dpop[1] = -z*C + e*aCR
+    return _dpop
+
+def jac(pop, t, r, a, z, e):
     R, C = pop
-    dR = r*R - a*C*R
-    dC = -z*C + e*a*C*R
-    return np.array([dR, dC])
+    _jac[0, 0] = r - a*C
+    _jac[0, 1] = -a*R
+    _jac[1, 0] = e*a*C
+    _jac[1, 1] = -z + e*a*R
+    return _jac
+
+def dCR_dt(pop, t=0.0):
+    return rhs(pop, t, r, a, z, e).copy()
+
+def simulate(r=r, a=a, z=z, e=e, R0=R0, C0=C0, t0=t0, tmax=tmax, dt=dt,
+             rtol=None, atol=None, use_jac=True):
+    """Integrate with odeint; return t, pops (n x 2) and a dict of solver statistics."""
+    t = np.arange(t0, tmax + dt, dt)
+    t_start = time.perf_counter()
+    pops, info = integrate.odeint(rhs, y0=(R0, C0), t=t, args=(r, a, z, e),
+                                  Dfun=jac if use_jac else None,
+                                  rtol=rtol, atol=atol, full_output=True)
+    return t, pops, _odeint_stats(info, use_jac, rtol, atol, len(t), time.perf_counter() - t_start)
+
+def _odeint_stats(info, use_jac, rtol, atol, n_out, seconds):
+    return {"solver": "odeint", "use_jac": use_jac, "rtol": rtol, "atol": atol,
+            "n_out": n_out, "nst": int(info["nst"][-1]), "nfe": int(info["nfe"][-1]),
+            "nje": int(info["nje"][-1]),
+            "method_switches": int(np.count_nonzero(np.diff(info["mused"]))),
+            "last_method": "adams" if info["mused"][-1] == 1 else "bdf",
+            "seconds": seconds, "message": info["message"]}
+
+# -----------------------
+# Many orbits, one solver call
+# -----------------------
+def rhs_orbits(y, t, r, a, z, e):
+    R, C = y[0::2], y[1::2]
+    aCR = a*C*R
+    out = np.empty_like(y)
+    out[0::2] = r*R - aCR
+    out[1::2] = -z*C + e*aCR
+    return out
+
+def jac_orbits(y, t, r, a, z, e):
+    """Banded Jacobian: row k holds d f_i / d y_j for i - j = k - 1 (odeint layout, mu=1)."""
+    R, C = y[0::2], y[1::2]
+    band = np.zeros((3, len(y)))
+    band[0, 1::2] = -a*R            # dR_k/dC_k (superdiagonal)
+    band[1, 0::2] = r - a*C         # dR_k/dR_k
+    band[1, 1::2] = -z + e*a*R      # dC_k/dC_k
+    band[2, 0::2] = e*a*C           # dC_k/dR_k (subdiagonal)
+    return band
+
+def simulate_orbits(R0s, C0s, r=r, a=a, z=z, e=e, t0=t0, tmax=tmax, dt=dt,
+                    rtol=None, atol=None, use_jac=True):
+    """Integrate len(R0s) orbits together; return t, R (n x N), C (n x N) and solver statistics."""
+    R0s, C0s = np.broadcast_arrays(np.asarray(R0s, dtype=float), np.asarray(C0s, dtype=float))
+    y0 = np.empty(2*R0s.size)
+    y0[0::2], y0[1::2] = R0s.ravel(), C0s.ravel()
+    t = np.arange(t0, tmax + dt, dt)
+    t_start = time.perf_counter()
+    ys, info = integrate.odeint(rhs_orbits, y0, t, args=(r, a, z, e),
+                                Dfun=jac_orbits if use_jac else None, ml=1, mu=1,
+                                rtol=rtol, atol=atol, full_output=True)
+    stats = _odeint_stats(info, use_jac, rtol, atol, len(t), time.perf_counter() - t_start)
+    stats["n_orbits"] = int(R0s.size)
+    return t, ys[:, 0::2], ys[:, 1::2], stats
+
+def report(stats, stats_json=None):
+    print(f"Solver: odeint ({stats['last_method']}), {stats['nst']} steps, {stats['nfe']} RHS evaluations, "
+          f"{stats['nje']} Jacobian evaluations, {stats['seconds']*1e3:.2f} ms")
+    if stats_json == "-":
+        print(json.dumps(stats))
+    elif stats_json:
+        Path(stats_json).write_text(json.dumps(stats, indent=1))
+
+# -----------------------
+# Figure specs (rendered by LVrender)
+# -----------------------
+def timeseries_spec(t, pops, path, label="", max_points=0, raster=False, dpi=200):
+    opts = dict(max_points=max_points, raster=raster)
+    return {"path": str(path), "figsize": (7, 4), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.line(t, pops[:, 0], "g-", label="Resource R (prey)", **opts),
+        LVrender.line(t, pops[:, 1], "b-", label="Consumer C (predator)", **opts),
+        LVrender.op("grid", True),
+        LVrender.op("legend", loc="best"),
+        LVrender.op("set_xlabel", "Time"),
+        LVrender.op("set_ylabel", "Population density"),
+        LVrender.op("set_title", "Lotka–Volterra (time series)"),
+        LVrender.op("text", 0.02, 0.95, label, transform="axes", va="top", ha="left"),
+    ]]}
+
+def phaseplane_spec(t, pops, path, max_points=0, raster=False, dpi=200):
+    idx = LVplot.thin(len(t), max_points)
+    return {"path": str(path), "figsize": (5.2, 5.2), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.op("plot", pops[idx, 0], pops[idx, 1], "-", rasterized=raster or None),
+        LVrender.op("set_xlabel", "Resource R"),
+        LVrender.op("set_ylabel", "Consumer C"),
+        LVrender.op("set_title", "Lotka–Volterra (phase plane)"),
+        LVrender.op("grid", True),
+    ]]}
+
+def orbits_spec(t, R, C, s, path, max_points=0, raster=False, dpi=200):
+    idx = LVplot.thin(len(t), max_points)
+    segments = np.stack([R[idx].T, C[idx].T], axis=-1)
+    return {"path": str(path), "figsize": (5.2, 5.2), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.op("line_collection", segments, array=s, cmap="viridis", linewidths=0.8, rasterized=raster),
+        LVrender.op("set_xlabel", "Resource R"),
+        LVrender.op("set_ylabel", "Consumer C"),
+        LVrender.op("set_title", f"Lotka–Volterra ({len(s)} orbits)"),
+        LVrender.op("grid", True),
+    ]]}
+
+def main_orbits(args):
+    # orbits through points on the ray from the coexistence equilibrium (z/(e a), r/a)
+    s = np.linspace(1.05, 6.0, args.orbits)
+    with LVtiming.phase("simulate"):
+        t, R, C, stats = simulate_orbits(args.z/(args.e*args.a)*s, args.r/args.a*s,
+                                         args.r, args.a, args.z, args.e, t0, args.tmax, args.dt,
+                                         rtol=args.rtol, atol=args.atol, use_jac=not args.no_jac)
+    report(stats, args.stats_json)
+    LVstore.save_args(args, t, R, C, {k: getattr(args, k) for k in ("r", "a", "z", "e", "dt")} | {"scale": s})
+    if args.no_plot:
+        return
+
+    LVrender.render_all([orbits_spec(t, R, C, s, FIG3, args.max_points, args.raster, args.dpi)],
+                        args.render_workers)
+    print(f"[OK] Saved: {FIG3.name} -> {OUT_DIR}")
 
 def main():
+    p = argparse.ArgumentParser(description="Continuous-time LV; saves time-series and phase-plane PDFs.",
+                                allow_abbrev=False)
+    for k, v in (("r", r), ("a", a), ("z", z), ("e", e), ("R0", R0), ("C0", C0), ("tmax", tmax), ("dt", dt)):
+        p.add_argument(f"--{k}", type=float, default=v)
+    p.add_argument("--rtol", type=float, default=None, help="odeint rtol (default: solver default)")
+    p.add_argument("--atol", type=float, default=None, help="odeint atol (default: solver default)")
+    p.add_argument("--no-jac", action="store_true", help="let odeint difference the Jacobian")
+    p.add_argument("--stats-json", type=str, default=None,
+                   help="write solver statistics as JSON to this path ('-' for stdout)")
+    p.add_argument("--orbits", type=int, default=0,
+                   help="integrate this many orbits in one call and save a many-orbit phase portrait")
+    LVplot.add_args(p)
+    LVstore.add_args(p)
+    args = p.parse_args()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
+    if args.orbits:
+        return main_orbits(args)
 
     # time grid & solve
-    t = np.arange(t0, tmax + dt, dt)
-    pops, infodict = integrate.odeint(dCR_dt, y0=(R0, C0), t=t, full_output=True)
-
-    # ---------------
-    # Figure 1: time series
-    # ---------------
-    fig1, ax1 = plt.subplots(figsize=(7, 4))
-    ax1.plot(t, pops[:, 0], "g-", label="Resource R (prey)")
-    ax1.plot(t, pops[:, 1], "b-", label="Consumer C (predator)")
-    ax1.grid(True)
-    ax1.legend(loc="best")
-    ax1.set_xlabel("Time")
-    ax1.set_ylabel("Population density")
-    ax1.set_title("Lotka–Volterra (time series)")
+    with LVtiming.phase("simulate"):
+        t, pops, stats = simulate(args.r, args.a, args.z, args.e, args.R0, args.C0, t0, args.tmax, args.dt,
+                                  rtol=args.rtol, atol=args.atol, use_jac=not args.no_jac)
+    report(stats, args.stats_json)
+    LVstore.save_args(args, t, pops[:, 0], pops[:, 1],
+                      {k: getattr(args, k) for k in ("r", "a", "z", "e", "R0", "C0", "dt")})
+    if args.no_plot:
+        return
+
+    # Figure 1: time series; Figure 2 (“Fig. 15”): phase-plane (C vs R)
     # Optional: include params in the plot for clarity
-    txt = f"r={r}, a={a}, z={z}, e={e}; R0={R0}, C0={C0}"
-    ax1.text(0.02, 0.95, txt, transform=ax1.transAxes, va="top", ha="left")
-    fig1.tight_layout()
-    fig1.savefig(FIG1)
-    plt.close(fig1)
-
-    # ---------------
-    # Figure 2 (“Fig. 15”): phase-plane (C vs R)
-    # ---------------
-    R = pops[:, 0]
-    C = pops[:, 1]
-    fig2, ax2 = plt.subplots(figsize=(5.2, 5.2))
-    ax2.plot(R, C, "-")
-    ax2.set_xlabel("Resource R")
-    ax2.set_ylabel("Consumer C")
-    ax2.set_title("Lotka–Volterra (phase plane)")
-    ax2.grid(True)
-    fig2.tight_layout()
-    fig2.savefig(FIG2)
-    plt.close(fig2)
+    txt = f"r={args.r}, a={args.a}, z={args.z}, e={args.e}; R0={args.R0}, C0={args.C0}"
+    LVrender.render_all([timeseries_spec(t, pops, FIG1, txt, args.max_points, args.raster, args.dpi),
+                         phaseplane_spec(t, pops, FIG2, args.max_points, args.raster, args.dpi)],
+                        args.render_workers)
 
     # A small success message (not required by the notes, but handy)
     print(f"[OK] Saved: {FIG1.name}, {FIG2.name} -> {OUT_DIR}")
@@ -6,20 +6,99 @@ Takes parameters from CLI, saves a PDF, prints final (non-zero) populations.
 Model:
     dR/dt = r*R*(1 - R/K) - a*C*R
     dC/dt = -z*C + e*a*C*R
+
+Any parameter or initial condition of simulate() may be a NumPy array; they are
+broadcast together and the whole grid is stepped in one vectorised time loop
+(R, C then have shape (n, *broadcast_shape)). See LVgrid.sweep for labelled grids.
+
+method="euler" (default) is the fixed-step scheme above; any scipy solve_ivp
+method (RK45, DOP853, LSODA, BDF, ...) integrates adaptively with rtol/atol
+and samples the dense output on the same t grid (see simulate_ivp()).
+backend="numba" runs the Euler loop as a compiled kernel (LVjit).
+
+events=True stops at the first extinction, equilibrium (|dR/dt|, |dC/dt| <= eq_tol)
+or blow-up (population > bound) and returns t, R, C truncated there plus an
+LVjit.Event(kind, time, step); for arrays it stops once every point has had one.
+stream() yields the trajectory in bounded-memory chunks (see LVstream);
+summary() reduces it on the fly to one record of statistics (see LVsummary).
+--no-plot skips the figure (matplotlib is then never imported); --max-points
+(min/max decimation) and --raster keep PDFs of long runs small (see LVplot).
 """
 import argparse
 from pathlib import Path
-import numpy as np
-import matplotlib
-matplotlib.use("Agg")  # no GUI
-import matplotlib.pyplot as plt
+import LVtiming
+with LVtiming.phase("import"):
+    import numpy as np
+    import LVcache, LVjit, LVplot, LVrender, LVstore, LVstream, LVsummary  # matplotlib only when plotting
+
+def step(R, C, r, a, z, e, K, dt):
+    """One forward-Euler step for broadcastable arrays."""
+    dR = r*R*(1 - R/K) - a*C*R
+    dC = -z*C + e*a*C*R
+    return np.maximum(R + dR*dt, 0.0), np.maximum(C + dC*dt, 0.0)
+
+IVP_METHODS = ("RK45", "RK23", "DOP853", "LSODA", "BDF", "Radau")
+
+def rhs(t, y, r, a, z, e, K):
+    R, C = y
+    return [r*R*(1 - R/K) - a*C*R, -z*C + e*a*C*R]
+
+def jac(t, y, r, a, z, e, K):
+    R, C = y
+    return [[r*(1 - 2*R/K) - a*C, -a*R],
+            [e*a*C, -z + e*a*R]]
+
+def simulate_ivp(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
+                 tmax=60.0, dt=0.01, R0=10.0, C0=5.0,
+                 method="RK45", rtol=1e-6, atol=1e-9):
+    """Adaptive integration; returns t, R, C and a dict of solver statistics."""
+    from scipy.integrate import solve_ivp
+    if any(np.ndim(v) for v in (r, a, z, e, K, R0, C0)):
+        raise ValueError("simulate_ivp() takes scalar parameters; use method='euler' for arrays")
+    n = int(tmax / dt) + 1
+    t = np.linspace(0.0, tmax, n)
+    opts = {} if method in ("RK45", "RK23", "DOP853") else {"jac": jac}
+    sol = solve_ivp(rhs, (0.0, t[-1]), [float(R0), float(C0)], method=method,
+                    dense_output=True, rtol=rtol, atol=atol, args=(r, a, z, e, K), **opts)
+    if not sol.success:
+        raise RuntimeError(f"solve_ivp({method}) failed: {sol.message}")
+    # the exact flow stays non-negative; clip only round-off from interpolation
+    R, C = np.maximum(sol.sol(t), 0.0)
+    stats = {"method": method, "rtol": rtol, "atol": atol, "nsteps": len(sol.t) - 1,
+             "nfev": int(sol.nfev), "njev": int(sol.njev), "nlu": int(sol.nlu)}
+    return t, R, C, stats
 
 def simulate(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
-             tmax=60.0, dt=0.01, R0=10.0, C0=5.0):
+             tmax=60.0, dt=0.01, R0=10.0, C0=5.0,
+             method="euler", rtol=1e-6, atol=1e-9, backend="python",
+             events=False, eq_tol=1e-8, bound=1e6):
+    LVjit.check_backend(backend)
+    if events and method != "euler":
+        raise ValueError("events=True is only implemented for method='euler'")
+    if method != "euler":
+        t, R, C, _ = simulate_ivp(r, a, z, e, K, tmax, dt, R0, C0, method, rtol, atol)
+        return t, R, C
     n = int(tmax / dt) + 1
     t = np.linspace(0.0, tmax, n)
+    if any(np.ndim(v) for v in (r, a, z, e, K, R0, C0)):
+        shape = np.broadcast_shapes(*(np.shape(v) for v in (r, a, z, e, K, R0, C0)))
+        R = np.zeros((n, *shape)); C = np.zeros((n, *shape))
+        R[0], C[0] = R0, C0
+        if events:
+            last, kind, at = LVjit.run_events(lambda R_, C_: step(R_, C_, r, a, z, e, K, dt),
+                                              R, C, dt, eq_tol, bound)
+            return t[:last+1], R[:last+1], C[:last+1], LVjit.Event(kind, t[at], at)
+        for i in range(n - 1):
+            R[i+1], C[i+1] = step(R[i], C[i], r, a, z, e, K, dt)
+        return t, R, C
     R = np.zeros(n); C = np.zeros(n)
     R[0], C[0] = float(R0), float(C0)
+    if backend == "numba" or events:
+        last, code = LVjit.kernel(LVjit.lv2_kernel, backend)(
+            R, C, float(r), float(a), float(z), float(e), float(K), float(dt), events, eq_tol, bound)
+        if events:
+            return t[:last+1], R[:last+1], C[:last+1], LVjit.Event(LVjit.EVENTS[code], t[last], last)
+        return t, R, C
     for i in range(n - 1):
         dR = r*R[i]*(1 - R[i]/K) - a*C[i]*R[i]
         dC = -z*C[i] + e*a*C[i]*R[i]
@@ -27,6 +106,34 @@ def simulate(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
         C[i+1] = max(C[i] + dC*dt, 0.0)
     return t, R, C
 
+def stream(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
+           tmax=60.0, dt=0.01, R0=10.0, C0=5.0, backend="numba", chunk=65536, every=1):
+    """Yield (t, R, C) chunks of the Euler trajectory, keeping every k-th step."""
+    LVjit.check_backend(backend)
+    n = int(tmax / dt) + 1
+    k = LVjit.kernel(LVjit.lv2_kernel, backend)
+    pars = (float(r), float(a), float(z), float(e), float(K), float(dt))
+    return LVstream.stream(lambda R, C: k(R, C, *pars), float(R0), float(C0), n,
+                           t_step=tmax / (n - 1), chunk=chunk, every=every)
+
+def summary(*args, chunk=4096, **kwargs):
+    """Final/min/max/mean/peaks/period of R and C without keeping the trajectory."""
+    return LVsummary.summarise(stream(*args, chunk=chunk, **kwargs))
+
+def figure_spec(t, R, C, path, label="", max_points=0, raster=False, dpi=200):
+    """LVrender spec of the R, C time series (label: parameter text box)."""
+    opts = dict(max_points=max_points, raster=raster)
+    return {"path": str(path), "figsize": (7, 4), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.line(t, R, label="Resource R (prey)", **opts),
+        LVrender.line(t, C, label="Consumer C (predator)", **opts),
+        LVrender.op("set_xlabel", "Time"),
+        LVrender.op("set_ylabel", "Population"),
+        LVrender.op("set_title", "Lotka–Volterra with Prey Density Dependence (K)"),
+        LVrender.op("grid", True),
+        LVrender.op("legend", loc="best"),
+        LVrender.op("text", 0.02, 0.95, label, transform="axes", ha="left", va="top"),
+    ]]}
+
 def main():
     p = argparse.ArgumentParser(
         description="LV with prey density dependence (K). Saves PDF and prints final populations."
@@ -40,35 +147,65 @@ def main():
     p.add_argument("--dt", type=float, default=0.01)
     p.add_argument("--R0", type=float, default=10.0)
     p.add_argument("--C0", type=float, default=5.0)
+    p.add_argument("--method", choices=["euler", *IVP_METHODS], default="euler",
+                   help="fixed-step forward Euler (default) or an adaptive solve_ivp method")
+    p.add_argument("--backend", choices=LVjit.BACKENDS, default="python",
+                   help="Euler loop in pure Python or as a numba kernel")
+    p.add_argument("--events", action="store_true",
+                   help="stop early on extinction, equilibrium or blow-up")
+    p.add_argument("--eq-tol", type=float, default=1e-8)
+    p.add_argument("--bound", type=float, default=1e6)
+    p.add_argument("--rtol", type=float, default=1e-6)
+    p.add_argument("--atol", type=float, default=1e-9)
     p.add_argument("--pdf", type=str, default=None,
                    help="Output PDF path; default ../results/LV2.pdf")
+    p.add_argument("--summary", action="store_true",
+                   help="print a JSON record of summary statistics only (no trajectory, no plot)")
+    p.add_argument("--no-cache", action="store_true", help="always recompute; do not read or write the result cache")
+    p.add_argument("--refresh", action="store_true", help="recompute and overwrite the cached result")
+    LVplot.add_args(p)
+    LVstore.add_args(p)
     args = p.parse_args()
 
+    if args.summary:
+        with LVtiming.phase("simulate"):
+            rec = summary(args.r, args.a, args.z, args.e, args.K, args.tmax, args.dt,
+                          args.R0, args.C0, backend=args.backend)
+        print(LVsummary.dumps(rec))
+        return
+
     out_path = Path(args.pdf) if args.pdf else (Path(__file__).resolve().parents[1] / "results" / "LV2.pdf")
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    t, R, C = simulate(args.r, args.a, args.z, args.e, args.K, args.tmax, args.dt, args.R0, args.C0)
+    with LVtiming.phase("simulate"):
+        if args.events:
+            t, R, C, ev = simulate(args.r, args.a, args.z, args.e, args.K, args.tmax, args.dt, args.R0, args.C0,
+                                   backend=args.backend, events=True, eq_tol=args.eq_tol, bound=args.bound)
+            print(f"Event: {ev.kind} at t={ev.time:.2f} (step {ev.step})")
+        else:
+            params = dict(r=args.r, a=args.a, z=args.z, e=args.e, K=args.K, tmax=args.tmax, dt=args.dt,
+                          R0=args.R0, C0=args.C0)
+            cache = dict(use_cache=not args.no_cache, refresh=args.refresh, verbose=True)
+            if args.method == "euler":
+                t, R, C = LVcache.call(simulate, "LV2", {**params, "backend": args.backend}, **cache)
+                print(f"Solver: euler, {len(t) - 1} steps, {len(t) - 1} RHS evaluations")
+            else:
+                t, R, C, st = LVcache.call(simulate_ivp, "LV2_ivp", {**params, "method": args.method,
+                                           "rtol": args.rtol, "atol": args.atol}, **cache)
+                print(f"Solver: {st['method']} (rtol={st['rtol']}, atol={st['atol']}), {st['nsteps']} steps, "
+                      f"{st['nfev']} RHS evaluations, {st['njev']} Jacobian evaluations")
 
     # print final (non-zero) populations
     print(f"Final populations -> R: {R[-1]:.6f}, C: {C[-1]:.6f} (t={t[-1]:.2f})")
+    LVstore.save_args(args, t, R, C, {k: getattr(args, k) for k in ("r", "a", "z", "e", "K", "R0", "C0", "dt", "method", "backend")})
+    if args.no_plot:
+        return
 
     # plot
-    fig, ax = plt.subplots(figsize=(7, 4))
-    ax.plot(t, R, label="Resource R (prey)")
-    ax.plot(t, C, label="Consumer C (predator)")
-    ax.set_xlabel("Time")
-    ax.set_ylabel("Population")
-    ax.set_title("Lotka–Volterra with Prey Density Dependence (K)")
-    ax.grid(True)
-    ax.legend(loc="best")
-    ax.text(
-        0.02, 0.95,
-        f"r={args.r}, a={args.a}, z={args.z}, e={args.e}, K={args.K}\n"
-        f"R0={args.R0}, C0={args.C0}, tmax={args.tmax}, dt={args.dt}",
-        transform=ax.transAxes, ha="left", va="top"
-    )
-    fig.tight_layout()
-    fig.savefig(out_path)
+    label = (f"r={args.r}, a={args.a}, z={args.z}, e={args.e}, K={args.K}\n"
+             f"R0={args.R0}, C0={args.C0}, tmax={args.tmax}, dt={args.dt}")
+    LVrender.render_all([figure_spec(t, R, C, out_path, label, args.max_points, args.raster, args.dpi)],
+                        args.render_workers)
     print(f"[OK] Saved plot -> {out_path}")
 
 if __name__ == "__main__":
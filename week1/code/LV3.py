@@ -2,25 +2,81 @@
 """
 LV3.py — Discrete-time LV with prey density-dependence (K).
 Print final populations and save a PDF time-series plot (no GUI).
+Parameters and initial conditions of simulate() broadcast like in LV2.
+backend="numba" runs the scalar recurrence as a compiled kernel (LVjit).
+events=True stops early and also returns an LVjit.Event, as in LV2 (equilibrium
+means |R[i+1]-R[i]|, |C[i+1]-C[i]| <= eq_tol).
+stream() yields the trajectory in bounded-memory chunks (see LVstream);
+summary() reduces it on the fly to one record of statistics (see LVsummary).
+--no-plot skips the figure (matplotlib is then never imported); --max-points
+(min/max decimation) and --raster keep PDFs of long runs small (see LVplot).
 """
 import argparse
 from pathlib import Path
-import numpy as np
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+import LVtiming
+with LVtiming.phase("import"):
+    import numpy as np
+    import LVcache, LVjit, LVplot, LVrender, LVstore, LVstream, LVsummary  # matplotlib only when plotting
+
+def step(R, C, r, a, z, e, K):
+    """One map iteration for broadcastable arrays."""
+    return (np.maximum(R*(1 + r*(1 - R/K) - a*C), 0.0),
+            np.maximum(C*(1 - z + e*a*R), 0.0))
 
 def simulate(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
-             tmax=80, R0=10.0, C0=5.0):
+             tmax=80, R0=10.0, C0=5.0, backend="python",
+             events=False, eq_tol=1e-8, bound=1e6):
+    LVjit.check_backend(backend)
     n = int(tmax) + 1
     t = np.arange(n)
+    if any(np.ndim(v) for v in (r, a, z, e, K, R0, C0)):
+        shape = np.broadcast_shapes(*(np.shape(v) for v in (r, a, z, e, K, R0, C0)))
+        R = np.zeros((n, *shape)); C = np.zeros((n, *shape))
+        R[0], C[0] = R0, C0
+        if events:
+            last, kind, at = LVjit.run_events(lambda R_, C_: step(R_, C_, r, a, z, e, K),
+                                              R, C, 1.0, eq_tol, bound)
+            return t[:last+1], R[:last+1], C[:last+1], LVjit.Event(kind, t[at], at)
+        for i in range(n - 1):
+            R[i+1], C[i+1] = step(R[i], C[i], r, a, z, e, K)
+        return t, R, C
     R = np.zeros(n); C = np.zeros(n)
     R[0], C[0] = R0, C0
+    if backend == "numba" or events:
+        last, code = LVjit.kernel(LVjit.lv3_kernel, backend)(
+            R, C, float(r), float(a), float(z), float(e), float(K), events, eq_tol, bound)
+        if events:
+            return t[:last+1], R[:last+1], C[:last+1], LVjit.Event(LVjit.EVENTS[code], t[last], last)
+        return t, R, C
     for i in range(n-1):
         R[i+1] = max(R[i]*(1 + r*(1 - R[i]/K) - a*C[i]), 0.0)
         C[i+1] = max(C[i]*(1 - z + e*a*R[i]), 0.0)
     return t, R, C
 
+def stream(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
+           tmax=80, R0=10.0, C0=5.0, backend="numba", chunk=65536, every=1):
+    """Yield (t, R, C) chunks of the trajectory, keeping every k-th step."""
+    LVjit.check_backend(backend)
+    k = LVjit.kernel(LVjit.lv3_kernel, backend)
+    pars = (float(r), float(a), float(z), float(e), float(K))
+    return LVstream.stream(lambda R, C: k(R, C, *pars), float(R0), float(C0), int(tmax) + 1,
+                           t_step=1, chunk=chunk, every=every)
+
+def summary(*args, chunk=4096, **kwargs):
+    """Final/min/max/mean/peaks/period of R and C without keeping the trajectory."""
+    return LVsummary.summarise(stream(*args, chunk=chunk, **kwargs))
+
+def figure_spec(t, R, C, path, label="", max_points=0, raster=False, dpi=200):
+    """LVrender spec of the R, C time series (label: parameter text box)."""
+    opts = dict(max_points=max_points, raster=raster)
+    return {"path": str(path), "figsize": (7,4), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.line(t, R, label="R (prey)", **opts), LVrender.line(t, C, label="C (predator)", **opts),
+        LVrender.op("set_xlabel", "Time step"), LVrender.op("set_ylabel", "Population"),
+        LVrender.op("set_title", "Discrete-time LV (with K)"),
+        LVrender.op("grid", True), LVrender.op("legend", loc="best"),
+        LVrender.op("text", 0.02, 0.95, label, transform="axes", va="top", ha="left"),
+    ]]}
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--r", type=float, default=1.0)
@@ -31,24 +87,44 @@ def main():
     p.add_argument("--tmax", type=int, default=80)
     p.add_argument("--R0", type=float, default=10.0)
     p.add_argument("--C0", type=float, default=5.0)
+    p.add_argument("--backend", choices=LVjit.BACKENDS, default="python")
+    p.add_argument("--events", action="store_true", help="stop early on extinction, equilibrium or blow-up")
+    p.add_argument("--eq-tol", type=float, default=1e-8)
+    p.add_argument("--bound", type=float, default=1e6)
     p.add_argument("--pdf", type=str, default=None)
+    p.add_argument("--summary", action="store_true", help="print a JSON record of summary statistics only")
+    p.add_argument("--no-cache", action="store_true", help="always recompute; do not read or write the result cache")
+    p.add_argument("--refresh", action="store_true", help="recompute and overwrite the cached result")
+    LVplot.add_args(p)
+    LVstore.add_args(p)
     args = p.parse_args()
 
+    if args.summary:
+        with LVtiming.phase("simulate"):
+            rec = summary(args.r,args.a,args.z,args.e,args.K,args.tmax,args.R0,args.C0,backend=args.backend)
+        print(LVsummary.dumps(rec))
+        return
+
     out = Path(args.pdf) if args.pdf else (Path(__file__).resolve().parents[1]/"results"/"LV3.pdf")
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    t, R, C = simulate(args.r,args.a,args.z,args.e,args.K,args.tmax,args.R0,args.C0)
+    with LVtiming.phase("simulate"):
+        if args.events:
+            t, R, C, ev = simulate(args.r,args.a,args.z,args.e,args.K,args.tmax,args.R0,args.C0,args.backend,
+                                   True, args.eq_tol, args.bound)
+            print(f"Event: {ev.kind} at t={ev.time} (step {ev.step})")
+        else:
+            t, R, C = LVcache.call(simulate, "LV3", dict(r=args.r,a=args.a,z=args.z,e=args.e,K=args.K,tmax=args.tmax,
+                                   R0=args.R0,C0=args.C0,backend=args.backend),
+                                   use_cache=not args.no_cache, refresh=args.refresh, verbose=True)
     print(f"Final DT pops -> R: {R[-1]:.6f}, C: {C[-1]:.6f} (t={t[-1]})")
+    LVstore.save_args(args, t, R, C, {k: getattr(args, k) for k in ("r", "a", "z", "e", "K", "R0", "C0", "backend")})
+    if args.no_plot:
+        return
 
-    fig, ax = plt.subplots(figsize=(7,4))
-    ax.plot(t, R, label="R (prey)")
-    ax.plot(t, C, label="C (predator)")
-    ax.set_xlabel("Time step"); ax.set_ylabel("Population")
-    ax.set_title("Discrete-time LV (with K)")
-    ax.grid(True); ax.legend(loc="best")
-    ax.text(0.02,0.95,f"r={args.r}, a={args.a}, z={args.z}, e={args.e}, K={args.K}\nR0={args.R0}, C0={args.C0}",
-            transform=ax.transAxes, va="top", ha="left")
-    fig.tight_layout(); fig.savefig(out)
+    label = f"r={args.r}, a={args.a}, z={args.z}, e={args.e}, K={args.K}\nR0={args.R0}, C0={args.C0}"
+    LVrender.render_all([figure_spec(t, R, C, out, label, args.max_points, args.raster, args.dpi)],
+                        args.render_workers)
     print(f"[OK] Saved plot -> {out}")
 
 if __name__ == "__main__":
@@ -2,21 +2,42 @@
 """
 LV4.py — Discrete-time LV with Gaussian noise on growth rates.
 Default: noise on prey growth (r + eps). Optionally also on z (consumer mortality).
+simulate_ensemble() advances many replicates at once (replicates x time arrays);
+each block of `block` steps draws the noise of all replicates from one
+Generator, seeded by the next child of SeedSequence(seed), so an ensemble is
+reproducible for a given (seed, replicates, block) but replicate j is not the
+same path as a single simulate() run.
+backend="numba" pre-draws the same noise and runs the loop as a compiled kernel (LVjit).
+events=True stops early and also returns an LVjit.Event, as in LV3.
+stream() yields the trajectory in bounded-memory chunks (see LVstream);
+summary() reduces it on the fly to one record of statistics (see LVsummary).
+--no-plot skips the figure (matplotlib is then never imported); --max-points
+(min/max decimation) and --raster keep PDFs of long runs small (see LVplot).
 """
 import argparse
 from pathlib import Path
-import numpy as np
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+import LVtiming
+with LVtiming.phase("import"):
+    import numpy as np
+    import LVcache, LVjit, LVplot, LVrender, LVstore, LVstream, LVsummary  # matplotlib only when plotting
 
 def simulate(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
-             tmax=80, R0=10.0, C0=5.0, sigma=0.05, both=False, seed=1234):
+             tmax=80, R0=10.0, C0=5.0, sigma=0.05, both=False, seed=1234, backend="python",
+             events=False, eq_tol=1e-8, bound=1e6):
+    LVjit.check_backend(backend)
     rng = np.random.default_rng(seed)
     n = int(tmax) + 1
     t = np.arange(n)
     R = np.zeros(n); C = np.zeros(n)
     R[0], C[0] = R0, C0
+    if backend == "numba" or events:
+        # sigma*N(0,1) in (eps_r, eps_z) order: the same stream as the loop below
+        eps = sigma * rng.standard_normal((n - 1, 2 if both else 1))
+        last, code = LVjit.kernel(LVjit.lv4_kernel, backend)(
+            R, C, float(r), float(a), float(z), float(e), float(K), eps, bool(both), events, eq_tol, bound)
+        if events:
+            return t[:last+1], R[:last+1], C[:last+1], LVjit.Event(LVjit.EVENTS[code], t[last], last)
+        return t, R, C
     for i in range(n-1):
         eps_r = rng.normal(0.0, sigma)
         rr = r + eps_r
@@ -29,6 +50,100 @@ def simulate(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
         C[i+1] = max(C[i]*(1 - zz + e*a*R[i]), 0.0)
     return t, R, C
 
+def stream_ensemble(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
+                    tmax=80, R0=10.0, C0=5.0, sigma=0.05, both=False, seed=1234,
+                    replicates=1000, block=256, streams=None, n_streams=None):
+    """Yield time-major (t, R, C) blocks of shape (steps, replicates): the initial
+    state, then up to `block` steps at a time; only the current state is carried.
+
+    With streams (int array (replicates,)) each block draws n_streams noise paths
+    and replicate j follows path streams[j]: replicates sharing an index get
+    common random numbers, whatever the other replicates in the call."""
+    n = int(tmax) + 1
+    t = np.arange(n)
+    ss = np.random.SeedSequence(seed)
+    k = 2 if both else 1
+    sigma = np.asarray(sigma, dtype=float)
+    R = np.zeros(replicates); C = np.zeros(replicates)
+    R[:], C[:] = R0, C0
+    yield t[:1], R[None], C[None]
+    for i0 in range(0, n - 1, block):
+        m = min(block, n - 1 - i0)
+        # one generator per block (not per replicate): a single vectorised draw
+        g = np.random.default_rng(ss.spawn(1)[0])
+        if streams is None:
+            eps = g.standard_normal((m, replicates, k))
+        else:
+            eps = g.standard_normal((m, n_streams, k))[:, streams]
+        eps_r = eps[:, :, 0] * sigma
+        eps_z = eps[:, :, 1] * sigma if both else None
+        bR = np.empty((m, replicates)); bC = np.empty((m, replicates))
+        for s in range(m):
+            rr = r + eps_r[s]
+            zz = np.maximum(z + eps_z[s], 0.0) if both else z
+            R, C = np.maximum(R*(1 + rr*(1 - R/K) - a*C), 0.0), np.maximum(C*(1 - zz + e*a*R), 0.0)
+            bR[s], bC[s] = R, C
+        yield t[i0+1:i0+1+m], bR, bC
+
+def simulate_ensemble(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
+                      tmax=80, R0=10.0, C0=5.0, sigma=0.05, both=False, seed=1234,
+                      replicates=1000, block=256, quantiles=None, streams=None, n_streams=None):
+    """Return t and R, C of shape (replicates, n), or (len(quantiles), n) if quantiles given.
+    Parameters may also be arrays of shape (replicates,); streams/n_streams as in stream_ensemble()."""
+    n = int(tmax) + 1
+    t = np.arange(n)
+    # time-major (n, replicates): each step reads and writes contiguous rows
+    R = np.empty((n, replicates)); C = np.empty((n, replicates))
+    for tb, Rb, Cb in stream_ensemble(r, a, z, e, K, tmax, R0, C0, sigma, both, seed, replicates, block,
+                                      streams, n_streams):
+        R[tb], C[tb] = Rb, Cb
+    if quantiles is None:
+        return t, R.T, C.T
+    q = np.asarray(quantiles, dtype=float)
+    return t, np.quantile(R, q, axis=1), np.quantile(C, q, axis=1)
+
+def stream(r=1.0, a=0.5, z=0.3, e=0.75, K=50.0,
+           tmax=80, R0=10.0, C0=5.0, sigma=0.05, both=False, seed=1234,
+           backend="numba", chunk=65536, every=1):
+    """Yield (t, R, C) chunks; noise is drawn per block in simulate()'s order."""
+    LVjit.check_backend(backend)
+    rng = np.random.default_rng(seed)
+    k = LVjit.kernel(LVjit.lv4_kernel, backend)
+    pars = (float(r), float(a), float(z), float(e), float(K))
+    def advance(R, C):
+        eps = sigma * rng.standard_normal((len(R) - 1, 2 if both else 1))
+        k(R, C, *pars, eps, bool(both))
+    return LVstream.stream(advance, float(R0), float(C0), int(tmax) + 1,
+                           t_step=1, chunk=chunk, every=every)
+
+def summary(*args, chunk=4096, **kwargs):
+    """Final/min/max/mean/peaks/period of R and C without keeping the trajectory."""
+    return LVsummary.summarise(stream(*args, chunk=chunk, **kwargs))
+
+def figure_spec(t, R, C, path, label="", max_points=0, raster=False, dpi=200):
+    """LVrender spec of one noisy R, C time series (label: parameter text box)."""
+    opts = dict(max_points=max_points, raster=raster)
+    return {"path": str(path), "figsize": (7,4), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.line(t, R, label="R (prey)", **opts), LVrender.line(t, C, label="C (predator)", **opts),
+        LVrender.op("set_xlabel", "Time step"), LVrender.op("set_ylabel", "Population"),
+        LVrender.op("set_title", "Discrete-time LV with Gaussian noise"),
+        LVrender.op("grid", True), LVrender.op("legend", loc="best"),
+        LVrender.op("text", 0.02, 0.95, label, transform="axes", va="top", ha="left"),
+    ]]}
+
+def ensemble_spec(t, qR, qC, path, replicates, max_points=0, raster=False, dpi=200):
+    """LVrender spec of the ensemble medians and 5-95% bands (qR, qC: 3 x T quantiles)."""
+    opts = dict(max_points=max_points, raster=raster)
+    return {"path": str(path), "figsize": (7,4), "dpi": dpi if raster else "figure", "axes": [[
+        LVrender.band(t, qR[0], qR[2], color="C0", alpha=0.3, **opts),
+        LVrender.band(t, qC[0], qC[2], color="C1", alpha=0.3, **opts),
+        LVrender.line(t, qR[1], color="C0", label="R (prey), median & 90% band", **opts),
+        LVrender.line(t, qC[1], color="C1", label="C (predator), median & 90% band", **opts),
+        LVrender.op("set_xlabel", "Time step"), LVrender.op("set_ylabel", "Population"),
+        LVrender.op("set_title", f"Discrete-time LV with Gaussian noise ({replicates} replicates)"),
+        LVrender.op("grid", True), LVrender.op("legend", loc="best"),
+    ]]}
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--r", type=float, default=1.0)
@@ -42,25 +157,72 @@ def main():
     p.add_argument("--sigma", type=float, default=0.05, help="stddev of Gaussian noise")
     p.add_argument("--both", action="store_true", help="also add noise to z")
     p.add_argument("--seed", type=int, default=1234)
+    p.add_argument("--backend", choices=LVjit.BACKENDS, default="python")
+    p.add_argument("--events", action="store_true", help="stop early on extinction, equilibrium or blow-up")
+    p.add_argument("--eq-tol", type=float, default=1e-8)
+    p.add_argument("--bound", type=float, default=1e6)
+    p.add_argument("--replicates", type=int, default=1,
+                   help="if >1, run an ensemble and plot the 5/50/95%% quantiles")
     p.add_argument("--pdf", type=str, default=None)
+    p.add_argument("--summary", action="store_true", help="print a JSON record of summary statistics only")
+    p.add_argument("--no-cache", action="store_true", help="always recompute; do not read or write the result cache")
+    p.add_argument("--refresh", action="store_true", help="recompute and overwrite the cached result")
+    LVplot.add_args(p)
+    LVstore.add_args(p)
     args = p.parse_args()
 
+    if args.summary:
+        with LVtiming.phase("simulate"):
+            rec = summary(args.r,args.a,args.z,args.e,args.K,args.tmax,args.R0,args.C0,
+                          args.sigma,args.both,args.seed,backend=args.backend)
+        print(LVsummary.dumps(rec))
+        return
+
     out = Path(args.pdf) if args.pdf else (Path(__file__).resolve().parents[1]/"results"/"LV4.pdf")
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    t, R, C = simulate(args.r,args.a,args.z,args.e,args.K,args.tmax,args.R0,args.C0,args.sigma,args.both,args.seed)
+    if args.replicates > 1:
+        return main_ensemble(args, out)
+
+    with LVtiming.phase("simulate"):
+        if args.events:
+            t, R, C, ev = simulate(args.r,args.a,args.z,args.e,args.K,args.tmax,args.R0,args.C0,args.sigma,args.both,
+                                   args.seed,args.backend,True,args.eq_tol,args.bound)
+            print(f"Event: {ev.kind} at t={ev.time} (step {ev.step})")
+        else:
+            t, R, C = LVcache.call(simulate, "LV4", dict(r=args.r,a=args.a,z=args.z,e=args.e,K=args.K,tmax=args.tmax,
+                                   R0=args.R0,C0=args.C0,sigma=args.sigma,both=args.both,seed=args.seed,
+                                   backend=args.backend),
+                                   use_cache=not args.no_cache, refresh=args.refresh, verbose=True)
     print(f"Final DT+noise pops -> R: {R[-1]:.6f}, C: {C[-1]:.6f} (t={t[-1]})")
+    LVstore.save_args(args, t, R, C, {k: getattr(args, k) for k in ("r", "a", "z", "e", "K", "R0", "C0", "sigma", "both", "seed", "backend")})
+    if args.no_plot:
+        return
+
+    label = (f"r={args.r}, a={args.a}, z={args.z}, e={args.e}, K={args.K}, sigma={args.sigma}, both={args.both}\n"
+             f"R0={args.R0}, C0={args.C0}")
+    LVrender.render_all([figure_spec(t, R, C, out, label, args.max_points, args.raster, args.dpi)],
+                        args.render_workers)
+    print(f"[OK] Saved plot -> {out}")
+
+def main_ensemble(args, out):
+    with LVtiming.phase("simulate"):
+        t, R, C = LVcache.call(simulate_ensemble, "LV4_ensemble",
+                               dict(r=args.r,a=args.a,z=args.z,e=args.e,K=args.K,tmax=args.tmax,R0=args.R0,C0=args.C0,
+                                    sigma=args.sigma,both=args.both,seed=args.seed,replicates=args.replicates),
+                               use_cache=not args.no_cache, refresh=args.refresh, verbose=True)
+    extinct = (R[:, -1] == 0) | (C[:, -1] == 0)
+    print(f"Ensemble ({args.replicates} reps) -> P(extinction by t={t[-1]}): {extinct.mean():.4f}")
+    qR = np.quantile(R, [0.05, 0.5, 0.95], axis=0)
+    qC = np.quantile(C, [0.05, 0.5, 0.95], axis=0)
+    print(f"Median final pops -> R: {qR[1, -1]:.6f}, C: {qC[1, -1]:.6f}")
+    LVstore.save_args(args, t, R, C, {k: getattr(args, k) for k in ("r", "a", "z", "e", "K", "R0", "C0", "sigma",
+                                                                   "both", "seed", "replicates")}, time_axis=1)
+    if args.no_plot:
+        return
 
-    fig, ax = plt.subplots(figsize=(7,4))
-    ax.plot(t, R, label="R (prey)")
-    ax.plot(t, C, label="C (predator)")
-    ax.set_xlabel("Time step"); ax.set_ylabel("Population")
-    ax.set_title("Discrete-time LV with Gaussian noise")
-    ax.grid(True); ax.legend(loc="best")
-    ax.text(0.02,0.95,
-            f"r={args.r}, a={args.a}, z={args.z}, e={args.e}, K={args.K}, sigma={args.sigma}, both={args.both}\nR0={args.R0}, C0={args.C0}",
-            transform=ax.transAxes, va="top", ha="left")
-    fig.tight_layout(); fig.savefig(out)
+    LVrender.render_all([ensemble_spec(t, qR, qC, out, args.replicates, args.max_points, args.raster, args.dpi)],
+                        args.render_workers)
     print(f"[OK] Saved plot -> {out}")
 
 if __name__ == "__main__":
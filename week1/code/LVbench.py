@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+LVbench.py — In-process benchmark suite for the LV simulators.
+
+Unlike LVspeedtest (one subprocess per script, so interpreter start-up and the
+numpy/scipy/matplotlib imports dominate), this imports the simulate()
+functions of LV1–LV4 and times only the calls: `warmup` untimed runs (numba
+compilation, caches), then `repeat` timed runs, reported as median, IQR and
+min. Every case is run at several sizes (tmax), so the per-step cost and its
+scaling can be compared across engines (odeint, Euler loop, numba kernel,
+solve_ivp, ensembles).
+
+    python LVbench.py                          # all cases, default sizes
+    python LVbench.py --cases LV3 --sizes 1e3 1e5 --json bench.json
+"""
+import argparse, json, platform, time
+from pathlib import Path
+import numpy as np
+import LV1, LV2, LV3, LV4, LVjit
+
+DT = 0.01   # step of the continuous-time cases
+
+def _ct(tmax):
+    return {"tmax": float(tmax), "dt": DT}
+
+# case -> (model, engine, n_steps(tmax), run(tmax))
+CASES = {
+    "LV1-odeint":      ("LV1", "odeint", lambda T: int(T / DT), lambda T: LV1.simulate(**_ct(T))),
+    "LV2-euler":       ("LV2", "python", lambda T: int(T / DT), lambda T: LV2.simulate(**_ct(T))),
+    "LV2-euler-numba": ("LV2", "numba", lambda T: int(T / DT), lambda T: LV2.simulate(**_ct(T), backend="numba")),
+    "LV2-RK45":        ("LV2", "RK45", lambda T: int(T / DT), lambda T: LV2.simulate(**_ct(T), method="RK45")),
+    "LV2-BDF":         ("LV2", "BDF", lambda T: int(T / DT), lambda T: LV2.simulate(**_ct(T), method="BDF")),
+    "LV3":             ("LV3", "python", int, lambda T: LV3.simulate(tmax=int(T))),
+    "LV3-numba":       ("LV3", "numba", int, lambda T: LV3.simulate(tmax=int(T), backend="numba")),
+    "LV4":             ("LV4", "python", int, lambda T: LV4.simulate(tmax=int(T), seed=1)),
+    "LV4-numba":       ("LV4", "numba", int, lambda T: LV4.simulate(tmax=int(T), seed=1, backend="numba")),
+    "LV4-ensemble":    ("LV4", "ensemble x1000", lambda T: 1000 * int(T),
+                        lambda T: LV4.simulate_ensemble(tmax=int(T), seed=1, replicates=1000)),
+}
+SIZES = (80, 400, 2000)
+
+def timeit(fn, warmup=1, repeat=7):
+    """Run fn warmup times untimed, then repeat times; return the timings in seconds."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+def stats(times):
+    q25, med, q75 = np.percentile(times, [25, 50, 75])
+    return {"median": float(med), "iqr": float(q75 - q25), "min": float(min(times))}
+
+def run_suite(cases=None, sizes=SIZES, warmup=1, repeat=7, verbose=True):
+    """Benchmark each case at each size; return a list of result records."""
+    records = []
+    for name in cases or CASES:
+        model, engine, n_steps, run = CASES[name]
+        for T in sizes:
+            times = timeit(lambda: run(T), warmup, repeat)
+            rec = {"case": name, "model": model, "engine": engine, "tmax": T, "n_steps": n_steps(T),
+                   **stats(times), "times": times}
+            rec["ns_per_step"] = 1e9 * rec["median"] / max(rec["n_steps"], 1)
+            records.append(rec)
+            if verbose:
+                print(f"{name:16s} tmax={T:<10g} median {rec['median']*1e3:10.3f} ms  "
+                      f"IQR {rec['iqr']*1e3:8.3f} ms  min {rec['min']*1e3:10.3f} ms  "
+                      f"{rec['ns_per_step']:9.1f} ns/step")
+    return records
+
+def environment():
+    env = {"python": platform.python_version(), "numpy": np.__version__,
+           "platform": platform.platform(), "machine": platform.machine(), "numba": LVjit.HAVE_NUMBA}
+    if LVjit.HAVE_NUMBA:
+        import numba
+        env["numba"] = numba.__version__
+    return env
+
+def main():
+    p = argparse.ArgumentParser(description="In-process benchmark of the LV simulate() engines.")
+    p.add_argument("--cases", nargs="+", default=None,
+                   help=f"case names or model prefixes (default all): {', '.join(CASES)}")
+    p.add_argument("--sizes", nargs="+", type=float, default=list(SIZES), help="tmax values")
+    p.add_argument("--warmup", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--json", type=str, default=None,
+                   help="Output JSON path; default ../results/LVbench.json")
+    args = p.parse_args()
+
+    cases = [c for c in CASES if args.cases is None or any(c == s or c.startswith(s) for s in args.cases)]
+    if not cases:
+        p.error(f"no case matches {args.cases}")
+    out = Path(args.json) if args.json else (Path(__file__).resolve().parents[1]/"results"/"LVbench.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    records = run_suite(cases, args.sizes, args.warmup, args.repeat)
+    out.write_text(json.dumps({"env": environment(), "warmup": args.warmup, "repeat": args.repeat,
+                               "results": records}, indent=1))
+    print(f"[OK] Saved benchmark -> {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+LVcache.py — Content-addressed on-disk cache for LV simulate() results.
+
+A result is keyed by sha256 over (model name, parameters incl. seed, code
+version), where the code version hashes the source of the simulating function
+and of every function in these scripts it calls, directly or through another
+LV module (step(), the LVjit kernels, ...). Any edit to that code misses the
+cache instead of returning stale numbers, while plotting or docstring edits
+elsewhere in the module keep it. Results (tuples of arrays, plus dicts
+such as solver statistics) are stored as compressed .npz files.
+
+The cache lives in $LV_CACHE_DIR (default ~/.cache/cmee_lv) and is capped at
+$LV_CACHE_MAX_MB megabytes (default 256); the least recently used entries are
+evicted first (a hit refreshes the entry's mtime).
+
+    python LVcache.py            # show cache location, size and entries
+    python LVcache.py --clear    # empty it
+"""
+import argparse, hashlib, inspect, json, os, tempfile
+from pathlib import Path
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+
+def cache_dir():
+    return Path(os.environ.get("LV_CACHE_DIR", Path.home() / ".cache" / "cmee_lv"))
+
+def max_bytes():
+    return int(float(os.environ.get("LV_CACHE_MAX_MB", 256)) * 2**20)
+
+def _local(obj):
+    """The plain function behind obj if it is defined in one of these scripts, else None."""
+    obj = getattr(obj, "py_func", obj)   # numba dispatchers (LVjit)
+    f = getattr(inspect.getmodule(obj), "__file__", None)
+    return obj if inspect.isfunction(obj) and f and Path(f).resolve().parent == HERE else None
+
+def _names(code):
+    """Global and attribute names used by code, including nested lambdas/functions."""
+    names = list(code.co_names)
+    for c in code.co_consts:
+        if inspect.iscode(c):
+            names += _names(c)
+    return names
+
+def _calls(fn, seen):
+    """fn plus, transitively, the local functions it refers to (by name or as module.attr)."""
+    if fn in seen:
+        return
+    seen[fn] = None
+    names = _names(fn.__code__)
+    for name in names:
+        v = fn.__globals__.get(name)
+        if inspect.ismodule(v) and Path(getattr(v, "__file__", "")).resolve().parent == HERE:
+            targets = [getattr(v, attr, None) for attr in names]
+        else:
+            targets = [v]
+        for w in map(_local, targets):
+            if w is not None:
+                _calls(w, seen)
+
+def code_version(fn):
+    """Hash of the source of fn and of the local functions it (transitively) calls."""
+    seen = {}
+    _calls(getattr(fn, "py_func", fn), seen)
+    h = hashlib.sha256()
+    for f in seen:
+        h.update(f"{f.__module__}.{f.__qualname__}\n".encode() + inspect.getsource(f).encode())
+    return h.hexdigest()[:16]
+
+def make_key(model, params, version):
+    blob = json.dumps({"model": model, "params": params, "code": version},
+                      sort_keys=True, default=lambda v: np.asarray(v).tolist())
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+def get(key):
+    """Return the cached tuple for key, or None."""
+    path = cache_dir() / f"{key}.npz"
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            n = int(z["n"])
+            out = tuple(json.loads(str(z[f"json_{i}"])) if f"json_{i}" in z else z[f"arr_{i}"]
+                        for i in range(n))
+    except (FileNotFoundError, OSError, KeyError, ValueError):
+        return None
+    os.utime(path)   # LRU: a hit makes the entry recent
+    return out
+
+def put(key, result):
+    d = cache_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    items = {"n": np.array(len(result))}
+    for i, v in enumerate(result):
+        if isinstance(v, dict):
+            items[f"json_{i}"] = np.array(json.dumps(v))
+        else:
+            items[f"arr_{i}"] = np.asarray(v)
+    # a unique temp name, so concurrent puts of the same key never share a file
+    with tempfile.NamedTemporaryFile(dir=d, prefix=f"{key}.", suffix=".tmp.npz", delete=False) as f:
+        np.savez_compressed(f, **items)
+    os.replace(f.name, d / f"{key}.npz")
+    evict()
+
+def entries():
+    """Finished cache files, least recently used first (in-flight *.tmp.npz writes excluded)."""
+    d = cache_dir()
+    files = [p for p in d.glob("*.npz") if not p.name.endswith(".tmp.npz")] if d.exists() else []
+    return sorted(files, key=lambda p: p.stat().st_mtime)
+
+def evict(limit=None):
+    """Delete least recently used entries until the cache fits in limit bytes."""
+    limit = max_bytes() if limit is None else limit
+    files = entries()
+    total = sum(p.stat().st_size for p in files)
+    for p in files:
+        if total <= limit:
+            break
+        total -= p.stat().st_size
+        p.unlink(missing_ok=True)
+
+def call(fn, model, params, use_cache=True, refresh=False, verbose=False):
+    """fn(**params), served from / stored in the cache."""
+    if not use_cache:
+        return fn(**params)
+    key = make_key(model, params, code_version(fn))
+    if not refresh:
+        hit = get(key)
+        if hit is not None:
+            if verbose: print(f"[cache] hit {key[:12]} ({cache_dir()})")
+            return hit
+    result = fn(**params)
+    put(key, result)
+    if verbose: print(f"[cache] stored {key[:12]} ({cache_dir()})")
+    return result
+
+def main():
+    p = argparse.ArgumentParser(description="Inspect or clear the LV result cache.")
+    p.add_argument("--clear", action="store_true")
+    args = p.parse_args()
+    if args.clear:
+        evict(0)
+    files = entries()
+    size = sum(f.stat().st_size for f in files)
+    print(f"{cache_dir()}: {len(files)} entries, {size/2**20:.2f} MiB (cap {max_bytes()/2**20:.0f} MiB)")
+
+if __name__ == "__main__":
+    main()
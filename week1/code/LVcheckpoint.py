@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+LVcheckpoint.py — Checkpoint/restart for long LV2/LV3/LV4 runs.
+
+run() advances the model kernel (LVjit) block by block, like LVstream, and
+every `checkpoint_every` steps writes the kept points as a compressed chunk
+plus a checkpoint: the step index, the current R and C and, for LV4, the
+np.random.default_rng bit-generator state. Rerunning the same command on the
+same directory resumes from the last checkpoint, and the concatenated chunks
+equal an uninterrupted run (and simulate()) bit for bit.
+
+The output directory is an LVstream chunk store (index.json + chunk_*.npz,
+readable with LVstream.read_chunk_store); the checkpoint lives in index.json
+under "state" and is replaced atomically. SIGTERM/SIGINT (what preemptible
+batch nodes send before eviction) checkpoint at the next block and exit; the
+handlers are only installed when run() is called from the main thread (Python
+delivers signals there only), so from other threads it just checkpoints on schedule.
+"""
+import argparse, inspect, json, os, signal, sys, threading, time
+from pathlib import Path
+import numpy as np
+import LVjit, LVstream
+
+MODELS = ("LV2", "LV3", "LV4")
+EXIT_PREEMPTED = 75   # EX_TEMPFAIL: rerun to resume
+
+def _defaults(model):
+    import LV2, LV3, LV4
+    mod = {"LV2": LV2, "LV3": LV3, "LV4": LV4}[model]
+    skip = ("backend", "chunk", "every")
+    return {k: v.default for k, v in inspect.signature(mod.stream).parameters.items() if k not in skip}
+
+def _model(model, backend, p):
+    """Return n, t_step and advance(R, C, rng) for one model's parameters."""
+    if model == "LV2":
+        k = LVjit.kernel(LVjit.lv2_kernel, backend)
+        n = int(p["tmax"] / p["dt"]) + 1
+        pars = tuple(float(p[x]) for x in ("r", "a", "z", "e", "K", "dt"))
+        return n, p["tmax"] / (n - 1), lambda R, C, rng: k(R, C, *pars)
+    pars = tuple(float(p[x]) for x in ("r", "a", "z", "e", "K"))
+    n = int(p["tmax"]) + 1
+    if model == "LV3":
+        k = LVjit.kernel(LVjit.lv3_kernel, backend)
+        return n, 1, lambda R, C, rng: k(R, C, *pars)
+    k = LVjit.kernel(LVjit.lv4_kernel, backend)
+    sigma, both = p["sigma"], bool(p["both"])
+    def advance(R, C, rng):
+        # same draw order as LV4.simulate: one row of noise per step
+        k(R, C, *pars, sigma * rng.standard_normal((len(R) - 1, 2 if both else 1)), both)
+    return n, 1, advance
+
+def _save(out_dir, index):
+    tmp = out_dir / "index.json.tmp"
+    tmp.write_text(json.dumps(index, indent=1))
+    os.replace(tmp, out_dir / "index.json")
+
+def load_state(out_dir):
+    """The checkpoint dict in out_dir (None if there is none yet)."""
+    path = Path(out_dir) / "index.json"
+    return json.loads(path.read_text()).get("state") if path.exists() else None
+
+def run(model, out_dir, checkpoint_every=10_000_000, every=1, backend="numba", verbose=False, **params):
+    """Run (or resume) a checkpointed simulation; return the final state dict.
+
+    The state is {"step", "R", "C", "rng", "done"}; with done false the run was
+    preempted and calling run() again continues it."""
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+    LVjit.check_backend(backend)
+    defaults = _defaults(model)
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise TypeError(f"unexpected parameters for {model}: {sorted(unknown)}")
+    every = int(every)
+    if every < 1 or checkpoint_every < 1:
+        raise ValueError("every and checkpoint_every must be >= 1")
+    checkpoint_every = every * max(1, int(checkpoint_every) // every)
+    params = json.loads(json.dumps({**defaults, **params}))
+    n, t_step, advance = _model(model, backend, params)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meta = {"model": model, "params": params, "every": every}
+    ipath = out_dir / "index.json"
+    if ipath.exists():
+        index = json.loads(ipath.read_text())
+        if index["meta"] != meta:
+            raise ValueError(f"{out_dir} holds a different run: {index['meta']}")
+    else:
+        rng = np.random.default_rng(params["seed"]) if model == "LV4" else None
+        index = {"meta": meta, "chunks": [{"file": "chunk_000000.npz", "start": 0, "size": 1}],
+                 "state": {"step": 0, "R": float(params["R0"]), "C": float(params["C0"]),
+                           "rng": rng.bit_generator.state if rng else None, "done": n == 1}}
+        np.savez_compressed(out_dir / "chunk_000000.npz", t=np.zeros(1), R=np.array([index["state"]["R"]]),
+                            C=np.array([index["state"]["C"]]))
+        _save(out_dir, index)
+    state = index["state"]
+    if state["done"]:
+        return state
+    rng = None
+    if model == "LV4":
+        rng = np.random.default_rng()
+        rng.bit_generator.state = state["rng"]
+    if verbose:
+        print(f"[{model}] resuming at step {state['step']} of {n - 1}" if state["step"]
+              else f"[{model}] starting, {n - 1} steps")
+
+    stop = []
+    handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        handlers = {s: signal.signal(s, lambda *_: stop.append(True)) for s in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        per_block = every * max(1, LVstream.BLOCK // every)
+        bufR = np.empty(per_block + 1); bufC = np.empty(per_block + 1)
+        i, R, C = state["step"], state["R"], state["C"]
+        while i < n - 1:
+            # one checkpoint segment; every segment starts on a kept step
+            end = min(i + checkpoint_every, n - 1)
+            steps, keptR, keptC = [], [], []
+            while i < end and not stop:
+                m = min(per_block, end - i)
+                bufR[0], bufC[0] = R, C
+                advance(bufR[:m+1], bufC[:m+1], rng)
+                sel = np.arange(every - i % every, m + 1, every)
+                steps.append(i + sel); keptR.append(bufR[sel]); keptC.append(bufC[sel])
+                R, C = float(bufR[m]), float(bufC[m])
+                i += m
+            steps = np.concatenate(steps) if steps else np.zeros(0, dtype=np.int64)
+            k = len(index["chunks"])
+            name = f"chunk_{k:06d}.npz"
+            np.savez_compressed(out_dir / name, t=steps*t_step, R=np.concatenate(keptR or [[]]),
+                                C=np.concatenate(keptC or [[]]))
+            last = index["chunks"][-1]
+            index["chunks"].append({"file": name, "start": last["start"] + last["size"], "size": len(steps)})
+            state = {"step": i, "R": R, "C": C, "rng": rng.bit_generator.state if rng else None,
+                     "done": i == n - 1}
+            index["state"] = state
+            _save(out_dir, index)
+            if verbose:
+                print(f"  checkpoint at step {i} ({i / (n - 1):.1%})")
+            if stop:
+                break
+    finally:
+        for s, h in handlers.items():
+            signal.signal(s, h)
+    return state
+
+def main():
+    p = argparse.ArgumentParser(description="Checkpointed (resumable) long LV run; rerun to resume.")
+    p.add_argument("--model", choices=MODELS, default="LV4")
+    p.add_argument("--tmax", type=float, default=1e8)
+    p.add_argument("--dt", type=float, default=0.01, help="LV2 only")
+    p.add_argument("--sigma", type=float, default=0.05, help="LV4 only")
+    p.add_argument("--both", action="store_true", help="LV4 only")
+    p.add_argument("--seed", type=int, default=1234, help="LV4 only")
+    p.add_argument("--every", type=int, default=1000, help="keep every k-th step")
+    p.add_argument("--checkpoint-every", type=int, default=10_000_000, help="steps between checkpoints")
+    p.add_argument("--backend", choices=LVjit.BACKENDS, default="numba")
+    p.add_argument("--out", type=str, default=None,
+                   help="Output directory; default ../results/checkpoint_<model>")
+    args = p.parse_args()
+
+    out = Path(args.out) if args.out else (Path(__file__).resolve().parents[1]/"results"/f"checkpoint_{args.model}")
+    params = {"tmax": args.tmax, "dt": args.dt} if args.model == "LV2" else {"tmax": int(args.tmax)}
+    if args.model == "LV4":
+        params.update(sigma=args.sigma, both=args.both, seed=args.seed)
+    t0 = time.perf_counter()
+    state = run(args.model, out, args.checkpoint_every, args.every, args.backend, verbose=True, **params)
+    secs = time.perf_counter() - t0
+    if not state["done"]:
+        print(f"[stopped] checkpointed at step {state['step']} after {secs:.2f}s; rerun to resume")
+        sys.exit(EXIT_PREEMPTED)
+    print(f"Final pops -> R: {state['R']:.6f}, C: {state['C']:.6f} (step {state['step']}) in {secs:.2f}s")
+    print(f"[OK] Saved -> {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+LVfit.py — Fast parameter estimation for LV2 (Euler) and LV3 from observed R, C series.
+
+Two building blocks replace "wrap simulate() in scipy.optimize":
+
+loss_batch()  sum-of-squares loss of a whole population of candidate parameter
+              vectors (B, d) from ONE broadcast LV2/LV3 simulate() call.
+loss_grad()   loss and exact gradient of one candidate from the forward
+              sensitivities S = d(R, C)/d(params) propagated along the
+              recursion (LV3's map is LV2's Euler step with dt = 1, so one
+              compiled LVjit-style kernel serves both; clamped steps have
+              zero sensitivity).
+
+fit(method="multistart") evaluates a scrambled Sobol' set of starts in one
+batch and refines the best few with L-BFGS-B using loss_grad();
+fit(method="de") runs scipy's differential evolution with vectorized=True
+(each generation is one loss_batch call) and polishes the same way.
+Parameters are any of r, a, z, e, K, R0, C0; missing observations may be NaN;
+log=True fits log densities instead.
+
+    python LVfit.py                       # synthetic LV2 data, both methods
+    python LVfit.py --data obs.csv --model LV3 --params r a z e K
+"""
+import argparse, json, time
+from collections import namedtuple
+from pathlib import Path
+import numpy as np
+from LVjit import jit, njit
+
+PARAMS = ("r", "a", "z", "e", "K", "R0", "C0")
+DEFAULTS = {"r": 1.0, "a": 0.5, "z": 0.3, "e": 0.75, "K": 50.0, "R0": 10.0, "C0": 5.0}
+BOUNDS = {"r": (0.05, 3.0), "a": (0.01, 2.0), "z": (0.01, 1.0), "e": (0.05, 1.0), "K": (1.0, 500.0)}
+LOG_EPS = 1e-6
+METHODS = ("multistart", "de")
+
+Data = namedtuple("Data", "model h n idx R C")
+
+def observations(model, t_obs, R_obs, C_obs, dt=0.01):
+    """Map observation times onto the model's step grid (LV2: multiples of dt; LV3: integers)."""
+    h = float(dt) if model == "LV2" else 1.0
+    if model not in ("LV2", "LV3"):
+        raise ValueError(f"model must be LV2 or LV3, got {model!r}")
+    t_obs = np.asarray(t_obs, dtype=float)
+    idx = np.rint(t_obs / h).astype(np.int64)
+    if np.any(np.abs(idx * h - t_obs) > 1e-6 * max(h, 1.0)) or np.any(idx < 0):
+        raise ValueError(f"observation times must be non-negative multiples of {h}")
+    order = np.argsort(idx, kind="stable")
+    return Data(model, h, int(idx.max()) + 1, idx[order],
+                np.asarray(R_obs, dtype=float)[order], np.asarray(C_obs, dtype=float)[order])
+
+def _full(names, X, fixed, data):
+    """Columns of X for names, completed with fixed values / defaults for the other PARAMS."""
+    X = np.asarray(X, dtype=float)
+    base = {**DEFAULTS, **{"R0": _first(data.R, data.idx, 10.0), "C0": _first(data.C, data.idx, 5.0)}, **fixed}
+    return [X[..., names.index(k)] if k in names else np.full(X.shape[:-1], float(base[k])) for k in PARAMS]
+
+def _first(obs, idx, default):
+    ok = (idx == 0) & ~np.isnan(obs)
+    return float(obs[ok][0]) if ok.any() else default
+
+def _residual(sim, obs, log):
+    if log:
+        return np.log(sim + LOG_EPS) - np.log(obs + LOG_EPS)
+    return sim - obs
+
+def loss_batch(data, X, names, log=False, **fixed):
+    """Loss of every row of X (B, len(names)) from one vectorised simulation; non-finite -> inf."""
+    import LV2, LV3
+    r, a, z, e, K, R0, C0 = _full(list(names), X, fixed, data)
+    if data.model == "LV2":
+        # half a step of slack so int(tmax/dt) lands on the last observed step
+        _, R, C = LV2.simulate(r, a, z, e, K, (data.n - 0.5) * data.h, data.h, R0, C0)
+    else:
+        _, R, C = LV3.simulate(r, a, z, e, K, data.n - 1, R0, C0)
+    with np.errstate(invalid="ignore", over="ignore"):
+        L = (np.nansum(_residual(R[data.idx], data.R[:, None], log)**2, axis=0) +
+             np.nansum(_residual(C[data.idx], data.C[:, None], log)**2, axis=0))
+    return np.where(np.isfinite(L), L, np.inf)
+
+@njit(cache=True)
+def _accumulate(sim, obs, S, grad, use_log, eps):
+    """Add one observation's squared residual to grad (via S); return the residual^2."""
+    if np.isnan(obs):
+        return 0.0
+    if use_log:
+        res = np.log(sim + eps) - np.log(obs + eps)
+        w = 1.0 / (sim + eps)
+    else:
+        res = sim - obs
+        w = 1.0
+    grad += 2.0 * res * w * S
+    return res * res
+
+@njit(cache=True)
+def sens_kernel(p, h, n, idx, Robs, Cobs, use_log, eps):
+    """Loss and d(loss)/d(r, a, z, e, K, R0, C0) of R' = R + h*dR, C' = C + h*dC."""
+    r, a, z, e, K = p[0], p[1], p[2], p[3], p[4]
+    R, C = p[5], p[6]
+    SR = np.zeros(7); SC = np.zeros(7); tmp = np.zeros(7)
+    SR[5] = 1.0; SC[6] = 1.0
+    grad = np.zeros(7)
+    loss = 0.0
+    k = 0
+    for i in range(n):
+        while k < len(idx) and idx[k] == i:
+            loss += _accumulate(R, Robs[k], SR, grad, use_log, eps)
+            loss += _accumulate(C, Cobs[k], SC, grad, use_log, eps)
+            k += 1
+        if i == n - 1:
+            break
+        growth = r*(1 - R/K) - a*C
+        Rn = R + h*R*growth
+        Cn = C + h*C*(-z + e*a*R)
+        dRR = 1 + h*(r*(1 - 2*R/K) - a*C)
+        dRC = -h*a*R
+        dCR = h*e*a*C
+        dCC = 1 + h*(-z + e*a*R)
+        tmp[:] = dCR*SR + dCC*SC
+        SR[:] = dRR*SR + dRC*SC
+        SC[:] = tmp
+        SR[0] += h*R*(1 - R/K); SR[1] -= h*C*R; SR[4] += h*r*R*R/(K*K)
+        SC[1] += h*e*C*R; SC[2] -= h*C; SC[3] += h*a*C*R
+        if Rn <= 0.0:
+            Rn = 0.0; SR[:] = 0.0
+        if Cn <= 0.0:
+            Cn = 0.0; SC[:] = 0.0
+        R, C = Rn, Cn
+    return loss, grad
+
+def loss_grad(data, x, names, log=False, **fixed):
+    """Loss and gradient (w.r.t. names) of one parameter vector x, via forward sensitivities."""
+    p = np.array([float(v) for v in _full(list(names), x, fixed, data)])
+    loss, grad = jit(sens_kernel)(p, data.h, data.n, data.idx, data.R, data.C, log, LOG_EPS)
+    if not np.isfinite(loss):
+        return np.inf, np.zeros(len(names))
+    return loss, grad[[PARAMS.index(k) for k in names]]
+
+def _bounds(names, bounds, data):
+    top = float(np.nanmax(np.concatenate([data.R, data.C]))) if len(data.R) else 100.0
+    b = {**BOUNDS, "R0": (0.0, 2 * top), "C0": (0.0, 2 * top), **(bounds or {})}
+    return np.array([b[k] for k in names], dtype=float)
+
+def _polish(data, x0, names, B, log, fixed):
+    from scipy.optimize import minimize
+    res = minimize(lambda x: loss_grad(data, x, names, log, **fixed), x0, jac=True, method="L-BFGS-B",
+                   bounds=B, options={"maxiter": 500})
+    return res.x, float(res.fun), int(res.nfev)
+
+def fit(data, names=("r", "a", "z", "e", "K"), bounds=None, method="multistart", n_starts=256, refine=4,
+        popsize=20, maxiter=200, log=False, seed=1234, **fixed):
+    """Fit names to data; return {"params", "loss", "nfev", "method", "seconds"}."""
+    names = list(names)
+    unknown = set(names) - set(PARAMS)
+    if unknown:
+        raise ValueError(f"unknown parameters {sorted(unknown)}; choose from {PARAMS}")
+    B = _bounds(names, bounds, data)
+    t0 = time.perf_counter()
+    if method == "multistart":
+        from scipy.stats import qmc
+        U = qmc.Sobol(len(names), scramble=True, seed=seed).random(n_starts)
+        X = B[:, 0] + U * (B[:, 1] - B[:, 0])
+        L = loss_batch(data, X, names, log, **fixed)
+        nfev = len(X)
+        best = (None, np.inf)
+        for j in np.argsort(L)[:refine]:
+            x, f, n = _polish(data, X[j], names, B, log, fixed)
+            nfev += n
+            if f < best[1]:
+                best = (x, f)
+        x, f = best
+    elif method == "de":
+        from scipy.optimize import differential_evolution
+        rows = []   # with vectorized=True res.nfev counts calls, not candidates
+        def batch(X):
+            rows.append(X.shape[1])
+            return loss_batch(data, X.T, names, log, **fixed)
+        res = differential_evolution(batch, B, vectorized=True, updating="deferred", popsize=popsize,
+                                     maxiter=maxiter, polish=False, seed=seed, tol=1e-8)
+        x, f, n = _polish(data, res.x, names, B, log, fixed)
+        nfev = sum(rows) + n
+    else:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    return {"params": dict(zip(names, map(float, x))), "loss": f, "nfev": nfev, "method": method,
+            "seconds": time.perf_counter() - t0}
+
+def synthetic(model="LV2", every=1.0, tmax=40.0, noise=0.05, seed=1, **params):
+    """Noisy (lognormal, sd `noise`) observations of a known trajectory, every `every` time units."""
+    import LV2, LV3
+    p = {**DEFAULTS, **params}
+    if model == "LV2":
+        t, R, C = LV2.simulate(p["r"], p["a"], p["z"], p["e"], p["K"], tmax, 0.01, p["R0"], p["C0"])
+        sel = np.arange(0, len(t), int(round(every / 0.01)))
+        t = np.round(t / 0.01) * 0.01   # exact multiples of dt for observations()
+    else:
+        t, R, C = LV3.simulate(p["r"], p["a"], p["z"], p["e"], p["K"], int(tmax), p["R0"], p["C0"])
+        sel = np.arange(0, len(t), max(1, int(every)))
+    rng = np.random.default_rng(seed)
+    jitter = lambda x: x * np.exp(noise * rng.standard_normal(len(x)))
+    return t[sel], jitter(R[sel]), jitter(C[sel])
+
+def main():
+    p = argparse.ArgumentParser(description="Fit LV2/LV3 parameters to R, C time series.")
+    p.add_argument("--model", choices=["LV2", "LV3"], default="LV2")
+    p.add_argument("--data", type=str, default=None,
+                   help="CSV with columns t,R,C (header line); default: synthetic data from known parameters")
+    p.add_argument("--params", nargs="+", choices=PARAMS, default=["r", "a", "z", "e", "K"])
+    p.add_argument("--method", choices=[*METHODS, "both"], default="both")
+    p.add_argument("--dt", type=float, default=0.01, help="LV2 Euler step")
+    p.add_argument("--starts", type=int, default=256, help="multistart: candidates evaluated in one batch")
+    p.add_argument("--refine", type=int, default=4, help="multistart: best candidates refined with gradients")
+    p.add_argument("--popsize", type=int, default=20)
+    p.add_argument("--maxiter", type=int, default=200)
+    p.add_argument("--log", action="store_true", help="fit log densities")
+    p.add_argument("--seed", type=int, default=1234)
+    p.add_argument("--out", type=str, default=None, help="Output JSON; default ../results/LVfit.json")
+    args = p.parse_args()
+
+    if args.data:
+        t_obs, R_obs, C_obs = np.loadtxt(args.data, delimiter=",", skiprows=1, unpack=True)
+    else:
+        t_obs, R_obs, C_obs = synthetic(args.model)
+        print(f"synthetic {args.model} data, true parameters: {DEFAULTS}")
+    data = observations(args.model, t_obs, R_obs, C_obs, args.dt)
+    out = Path(args.out) if args.out else (Path(__file__).resolve().parents[1]/"results"/"LVfit.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    fits = []
+    for method in (METHODS if args.method == "both" else [args.method]):
+        res = fit(data, args.params, method=method, n_starts=args.starts, refine=args.refine,
+                  popsize=args.popsize, maxiter=args.maxiter, log=args.log, seed=args.seed)
+        fits.append(res)
+        est = ", ".join(f"{k}={v:.4g}" for k, v in res["params"].items())
+        print(f"{method:10s} loss={res['loss']:.6g} ({res['nfev']} evaluations, {res['seconds']:.2f}s): {est}")
+    out.write_text(json.dumps({"model": args.model, "n_obs": len(t_obs), "fits": fits}, indent=1))
+    print(f"[OK] Saved -> {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+LVgrid.py — Labelled parameter grids for the broadcasting LV2/LV3 simulators.
+
+    import LV2, LVgrid
+    cube = LVgrid.sweep(LV2.simulate, {"r": np.linspace(0.5, 2, 100),
+                                       "K": np.linspace(10, 100, 100)}, tmax=60)
+    cube["R"].shape   # (n_time, 100, 100), dims ("t", "r", "K")
+
+The axes form an outer product; every other keyword is passed through unchanged.
+"""
+import argparse
+from pathlib import Path
+import numpy as np
+
+def outer(axes):
+    """Reshape each 1-D axis so the set broadcasts to an outer-product grid."""
+    k = len(axes)
+    return {name: np.asarray(v, dtype=float).reshape([-1 if j == i else 1 for j in range(k)])
+            for i, (name, v) in enumerate(axes.items())}
+
+def sweep(simulate, axes, **fixed):
+    """Run simulate() once over the full grid; return a labelled result cube (dict)."""
+    t, R, C = simulate(**fixed, **outer(axes))
+    shape = (len(t), *(len(np.atleast_1d(v)) for v in axes.values()))
+    return {"t": t,
+            "R": np.broadcast_to(R, shape),
+            "C": np.broadcast_to(C, shape),
+            "dims": ("t", *axes),
+            "coords": {"t": t, **{k: np.asarray(v, dtype=float) for k, v in axes.items()}},
+            "fixed": fixed}
+
+def save(cube, path):
+    np.savez_compressed(path, t=cube["t"], R=cube["R"], C=cube["C"],
+                        dims=np.array(cube["dims"]),
+                        **{f"coord_{k}": v for k, v in cube["coords"].items() if k != "t"})
+
+def main():
+    import LV2, LV3
+    p = argparse.ArgumentParser(description="Final-state grid over (r, K) for LV2 or LV3.")
+    p.add_argument("--model", choices=["LV2", "LV3"], default="LV2")
+    p.add_argument("--n", type=int, default=100, help="grid points per axis")
+    p.add_argument("--tmax", type=float, default=60.0)
+    p.add_argument("--out", type=str, default=None,
+                   help="Output .npz path; default ../results/<model>_grid.npz")
+    args = p.parse_args()
+
+    sim = {"LV2": LV2.simulate, "LV3": LV3.simulate}[args.model]
+    tmax = args.tmax if args.model == "LV2" else int(args.tmax)
+    axes = {"r": np.linspace(0.5, 2.0, args.n), "K": np.linspace(10.0, 100.0, args.n)}
+    cube = sweep(sim, axes, tmax=tmax)
+    out = Path(args.out) if args.out else (Path(__file__).resolve().parents[1]/"results"/f"{args.model}_grid.npz")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    save(cube, out)
+    RT = cube["R"][-1]
+    print(f"{args.model} grid {RT.shape}: final R in [{RT.min():.4f}, {RT.max():.4f}]")
+    print(f"[OK] Saved grid -> {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+LVjit.py — Compiled step kernels for LV2/LV3/LV4 (simulate(..., backend="numba")).
+
+The kernels are the same recurrences as the Python loops (including the
+max(..., 0) clamps) and fill preallocated R, C arrays in place. LV4's noise is
+drawn up front from the same generator in the same order, so every backend
+gives identical numbers. Without numba the kernels run as plain Python.
+
+numba is imported lazily: @njit only marks a function, and the first jit()
+(i.e. kernel(..., "numba")) compiles every marked function, so the default
+backend="python" never pays numba's import time.
+
+With events=True a kernel stops at the first step that triggers an event
+(see EVENTS) and returns (last_index, event_code); otherwise it returns
+(len(R) - 1, 0). simulate(..., events=True) in LV2/LV3/LV4 uses this.
+
+Run this file to check the numba backend against the Python implementation.
+"""
+import importlib.util
+from collections import namedtuple
+import numpy as np
+
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+_MARKED = []     # functions decorated with @njit, compiled together on the first jit()
+_COMPILED = {}   # plain function -> numba dispatcher
+
+def njit(*args, **kwargs):
+    """Mark a function for numba (options as numba.njit); it stays plain Python until jit()."""
+    def mark(f):
+        f.jit_options = kwargs
+        _MARKED.append(f)
+        return f
+    if args and callable(args[0]):
+        return mark(args[0])
+    return mark
+
+def jit(f):
+    """numba version of an @njit function (f itself without numba).
+
+    The first call imports numba and rebinds every marked function's module
+    global to its dispatcher, so compiled kernels can call each other."""
+    if not HAVE_NUMBA:
+        return getattr(f, "py_func", f)
+    if _MARKED:
+        import numba
+        while _MARKED:
+            g = _MARKED.pop()
+            _COMPILED[g] = g.__globals__[g.__name__] = numba.njit(**g.jit_options)(g)
+    return _COMPILED.get(f, f)
+
+BACKENDS = ("python", "numba")
+
+# event codes returned by the kernels (index into EVENTS)
+EVENTS = ("tmax", "prey_extinct", "predator_extinct", "equilibrium", "bound")
+Event = namedtuple("Event", "kind time step")
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+
+def kernel(k, backend):
+    """The compiled kernel for backend="numba", its Python source otherwise."""
+    return jit(k) if backend == "numba" else getattr(k, "py_func", k)
+
+@njit(cache=True)
+def event_code(Rp, Cp, Rn, Cn, scale, eq_tol, bound):
+    """Event for the step (Rp, Cp) -> (Rn, Cn); scale is dt (rates) or 1 (maps)."""
+    if Rn <= 0.0:
+        return 1
+    if Cn <= 0.0:
+        return 2
+    if Rn > bound or Cn > bound:
+        return 4
+    if abs(Rn - Rp) <= eq_tol*scale and abs(Cn - Cp) <= eq_tol*scale:
+        return 3
+    return 0
+
+def event_codes(Rp, Cp, Rn, Cn, scale, eq_tol, bound):
+    """Vectorised event_code() for broadcast grids (0 where nothing happened)."""
+    code = np.where((np.abs(Rn - Rp) <= eq_tol*scale) & (np.abs(Cn - Cp) <= eq_tol*scale), 3, 0)
+    code = np.where((Rn > bound) | (Cn > bound), 4, code)
+    code = np.where(Cn <= 0.0, 2, code)
+    return np.where(Rn <= 0.0, 1, code).astype(np.int8)
+
+def run_events(stepper, R, C, scale, eq_tol, bound):
+    """Step broadcast grids until every point has had an event (or tmax).
+
+    stepper(Rp, Cp) returns the next state. Returns (last_index, kinds, steps):
+    each point's event name (array of EVENTS entries) and the index it happened at."""
+    n = len(R)
+    code = np.zeros(R.shape[1:], dtype=np.int8)
+    at = np.full(R.shape[1:], n - 1)
+    last = n - 1
+    for i in range(n - 1):
+        R[i+1], C[i+1] = stepper(R[i], C[i])
+        new = event_codes(R[i], C[i], R[i+1], C[i+1], scale, eq_tol, bound)
+        new[code > 0] = 0
+        if new.any():
+            hit = new > 0
+            code[hit], at[hit] = new[hit], i + 1
+            if (code > 0).all():
+                last = i + 1
+                break
+    return last, np.array(EVENTS)[code], at
+
+@njit(cache=True)
+def lv2_kernel(R, C, r, a, z, e, K, dt, events=False, eq_tol=0.0, bound=np.inf):
+    for i in range(len(R) - 1):
+        dR = r*R[i]*(1 - R[i]/K) - a*C[i]*R[i]
+        dC = -z*C[i] + e*a*C[i]*R[i]
+        R[i+1] = max(R[i] + dR*dt, 0.0)
+        C[i+1] = max(C[i] + dC*dt, 0.0)
+        if events:
+            code = event_code(R[i], C[i], R[i+1], C[i+1], dt, eq_tol, bound)
+            if code:
+                return i + 1, code
+    return len(R) - 1, 0
+
+@njit(cache=True)
+def lv3_kernel(R, C, r, a, z, e, K, events=False, eq_tol=0.0, bound=np.inf):
+    for i in range(len(R) - 1):
+        R[i+1] = max(R[i]*(1 + r*(1 - R[i]/K) - a*C[i]), 0.0)
+        C[i+1] = max(C[i]*(1 - z + e*a*R[i]), 0.0)
+        if events:
+            code = event_code(R[i], C[i], R[i+1], C[i+1], 1.0, eq_tol, bound)
+            if code:
+                return i + 1, code
+    return len(R) - 1, 0
+
+@njit(cache=True)
+def lv4_kernel(R, C, r, a, z, e, K, eps, both, events=False, eq_tol=0.0, bound=np.inf):
+    """eps has shape (n-1, 2) if both else (n-1, 1), already scaled by sigma."""
+    for i in range(len(R) - 1):
+        rr = r + eps[i, 0]
+        if both:
+            zz = max(z + eps[i, 1], 0.0)
+        else:
+            zz = z
+        R[i+1] = max(R[i]*(1 + rr*(1 - R[i]/K) - a*C[i]), 0.0)
+        C[i+1] = max(C[i]*(1 - zz + e*a*R[i]), 0.0)
+        if events:
+            code = event_code(R[i], C[i], R[i+1], C[i+1], 1.0, eq_tol, bound)
+            if code:
+                return i + 1, code
+    return len(R) - 1, 0
+
+def main():
+    import time
+    import LV2, LV3, LV4
+    print(f"numba available: {HAVE_NUMBA}")
+    cases = [
+        ("LV2", LV2.simulate, dict(tmax=80.0, dt=0.005)),
+        ("LV2", LV2.simulate, dict(r=2.0, K=20.0, tmax=40.0, dt=0.05)),
+        ("LV2", LV2.simulate, dict(K=20.0, tmax=2000.0, events=True)),
+        ("LV3", LV3.simulate, dict(tmax=80)),
+        ("LV3", LV3.simulate, dict(r=2.7, K=30.0, tmax=500)),
+        ("LV4", LV4.simulate, dict(tmax=80, seed=1)),
+        ("LV4", LV4.simulate, dict(tmax=300, sigma=0.3, both=True, seed=7)),
+        ("LV4", LV4.simulate, dict(a=0.05, tmax=300, seed=7, events=True, bound=60.0)),
+    ]
+    ok = True
+    for name, sim, kw in cases:
+        sim(**kw, backend="numba")   # compile outside the timing
+        t0 = time.perf_counter(); ref = sim(**kw); t_py = time.perf_counter() - t0
+        t0 = time.perf_counter(); got = sim(**kw, backend="numba"); t_nb = time.perf_counter() - t0
+        same = all(np.array_equal(x, y) for x, y in zip(ref, got))
+        ok &= same
+        print(f"{'PASS' if same else 'FAIL'} {name} {kw}: python {t_py*1e3:.2f} ms, numba {t_nb*1e3:.2f} ms")
+    if not ok:
+        raise SystemExit("numba backend does not match the Python implementation")
+
+if __name__ == "__main__":
+    main()
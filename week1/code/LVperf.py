@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+LVperf.py — Performance results store and regression check.
+
+Timings are appended to a JSON-lines store (default ../results/perf_history.jsonl,
+or $LV_PERF_STORE), one line per case per run:
+
+    {"run", "time", "tag", "env": {host, python, numpy, platform, cpus, git},
+     "suite", "case", "size", "samples": [seconds, ...]}
+
+Sources: the LVbench suite (in-process, repeated samples), the `TIMING ...`
+lines printed by Vectorize1/Vectorize2 (one min-of-5 sample per process, so
+`record vectorize --runs k` gives k samples) and LVspeedtest --store.
+
+compare diffs a run (default: the latest) against a baseline (default: of the
+earlier runs sharing cases with it, the latest tagged "baseline", else the latest). A case is a regression
+when its median slows down by more than the threshold — the larger of
+--threshold and twice the baseline's relative IQR — and, where both sides have
+>= 3 samples, a one-sided Mann–Whitney U test gives p < --alpha. A case with
+fewer than 3 samples on either side (e.g. LVspeedtest's one-per-run "phases")
+is reported as "insufficient samples" and never fails. The command exits with
+status 1 if any case regressed.
+
+    python LVperf.py record bench --tag baseline
+    python LVperf.py record vectorize --runs 5
+    python Vectorize1.py | python LVperf.py record timing -
+    python LVperf.py list
+    python LVperf.py compare
+"""
+import argparse, json, os, platform, re, socket, subprocess, sys, time
+from pathlib import Path
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+TIMING = re.compile(r"^TIMING\s+(\S+)\s+(\S+)\s+N=(\d+)\s+ms=([0-9.eE+-]+)")
+MIN_SAMPLES = 3   # below this no significance test is possible
+
+def default_store():
+    return Path(os.environ.get("LV_PERF_STORE", HERE.parent / "results" / "perf_history.jsonl"))
+
+def environment():
+    try:
+        git = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                             text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        git = None
+    return {"host": socket.gethostname(), "python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count(), "git": git}
+
+def append(store, results, tag=None):
+    """Append results [{suite, case, size, samples}] to store as one run; return the run id."""
+    store = Path(store)
+    store.parent.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    env = environment()
+    run = time.strftime("%Y%m%dT%H%M%S", time.localtime(now)) + f".{int(now % 1 * 1000):03d}-{env['host']}"
+    head = {"run": run, "time": now, "tag": tag, "env": env}
+    with open(store, "a") as f:
+        for res in results:
+            f.write(json.dumps({**head, **res}) + "\n")
+    return run
+
+def load(store):
+    """All records in the store, oldest first."""
+    store = Path(store)
+    if not store.exists():
+        return []
+    with open(store) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def runs(records):
+    """{run id: [records]} in the order the runs were stored."""
+    out = {}
+    for rec in records:
+        out.setdefault(rec["run"], []).append(rec)
+    return out
+
+def parse_timing(lines, suite="vectorize"):
+    """Results from `TIMING <script> <mode> N=<n> ms=<ms>` lines; repeats become samples."""
+    samples = {}
+    for line in lines:
+        m = TIMING.match(line.strip())
+        if m:
+            script, mode, n, ms = m.groups()
+            samples.setdefault((f"{script} {mode}", int(n)), []).append(float(ms) / 1e3)
+    return [{"suite": suite, "case": c, "size": n, "samples": s} for (c, n), s in samples.items()]
+
+def from_bench(records, suite="LVbench"):
+    """Results from LVbench.run_suite() records."""
+    return [{"suite": suite, "case": r["case"], "size": r["tmax"], "samples": r["times"]} for r in records]
+
+def from_phases(records, suite="phases"):
+    """Results from LVtiming records (one sample per script and phase)."""
+    import LVtiming
+    return [{"suite": suite, "case": f"{script} {ph}", "size": None, "samples": [v["seconds"]]}
+            for script, per in LVtiming.aggregate(records).items() for ph, v in per.items()]
+
+def compare_case(base, new, threshold=0.10, alpha=0.05):
+    """Compare two sample lists; return a dict with medians, ratio, p value and verdict."""
+    base, new = np.asarray(base, dtype=float), np.asarray(new, dtype=float)
+    mb, mn = float(np.median(base)), float(np.median(new))
+    ratio = mn / mb if mb > 0 else np.inf
+    q25, q75 = np.percentile(base, [25, 75])
+    limit = max(threshold, 2 * (q75 - q25) / mb if mb > 0 else 0.0)
+    if len(base) < MIN_SAMPLES or len(new) < MIN_SAMPLES:
+        return {"base": mb, "new": mn, "ratio": ratio, "limit": limit, "p": None, "verdict": "insufficient samples"}
+    from scipy.stats import mannwhitneyu
+    p_slow = float(mannwhitneyu(new, base, alternative="greater").pvalue)
+    p_fast = float(mannwhitneyu(new, base, alternative="less").pvalue)
+    if ratio > 1 + limit and p_slow < alpha:
+        verdict = "REGRESSION"
+    elif ratio < 1 / (1 + limit) and p_fast < alpha:
+        verdict = "faster"
+    else:
+        verdict = "same"
+    return {"base": mb, "new": mn, "ratio": ratio, "limit": limit, "p": p_slow, "verdict": verdict}
+
+def compare(base_records, new_records, threshold=0.10, alpha=0.05):
+    """Compare the cases two runs share; return a list of rows."""
+    key = lambda r: (r["suite"], r["case"], r["size"])
+    base = {key(r): r["samples"] for r in base_records}
+    rows = []
+    for r in new_records:
+        if key(r) in base:
+            rows.append({"suite": r["suite"], "case": r["case"], "size": r["size"],
+                         **compare_case(base[key(r)], r["samples"], threshold, alpha)})
+    return rows
+
+def _pick(all_runs, which, default):
+    if which is None:
+        return default
+    hits = [r for r, recs in all_runs.items() if r.startswith(which) or recs[0].get("tag") == which]
+    if not hits:
+        sys.exit(f"no stored run matches {which!r}")
+    return hits[-1]
+
+def _cmd_record(args):
+    if args.source == "bench":
+        import LVbench
+        cases = [c for c in LVbench.CASES if args.cases is None or any(c.startswith(s) for s in args.cases)]
+        results = from_bench(LVbench.run_suite(cases, args.sizes or LVbench.SIZES, args.warmup, args.repeat))
+    elif args.source == "vectorize":
+        lines = []
+        for i in range(args.runs):
+            for script in ("Vectorize1.py", "Vectorize2.py"):
+                out = subprocess.run([sys.executable, str(HERE / script)], capture_output=True, text=True,
+                                     check=True).stdout
+                lines += out.splitlines()
+            print(f"  vectorize run {i + 1}/{args.runs}")
+        results = parse_timing(lines)
+    else:
+        lines = []
+        for f in args.files or ["-"]:
+            lines += (sys.stdin.read() if f == "-" else Path(f).read_text()).splitlines()
+        results = parse_timing(lines)
+    if not results:
+        sys.exit("nothing to record")
+    run = append(args.store, results, args.tag)
+    print(f"[OK] Recorded {len(results)} cases as run {run} -> {args.store}")
+
+def _cmd_list(args):
+    for run, recs in runs(load(args.store)).items():
+        env = recs[0]["env"]
+        tag = f" [{recs[0]['tag']}]" if recs[0].get("tag") else ""
+        suites = sorted({r["suite"] for r in recs})
+        print(f"{run}{tag}: {len(recs)} cases ({', '.join(suites)}); python {env['python']}, "
+              f"numpy {env['numpy']}, git {env['git']}")
+
+def _cmd_compare(args):
+    all_runs = runs(load(args.store))
+    ids = list(all_runs)
+    if len(ids) < 2:
+        sys.exit(f"need at least two stored runs in {args.store}")
+    new = _pick(all_runs, args.run, ids[-1])
+    keys = lambda run: {(r["suite"], r["case"], r["size"]) for r in all_runs[run]}
+    earlier = [r for r in ids[:ids.index(new)] if keys(r) & keys(new)]
+    tagged = [r for r in earlier if all_runs[r][0].get("tag") == "baseline"]
+    base = _pick(all_runs, args.baseline, tagged[-1] if tagged else (earlier[-1] if earlier else None))
+    if base is None or base == new:
+        sys.exit("no baseline run to compare against")
+    eb, en = all_runs[base][0]["env"], all_runs[new][0]["env"]
+    print(f"baseline {base} (git {eb['git']})  vs  run {new} (git {en['git']})")
+    for k in ("host", "python", "numpy", "platform"):
+        if eb[k] != en[k]:
+            print(f"  warning: {k} differs: {eb[k]} -> {en[k]}")
+    rows = compare(all_runs[base], all_runs[new], args.threshold, args.alpha)
+    if not rows:
+        sys.exit("the two runs share no cases")
+    print(f"{'case':32s} {'size':>8s} {'base ms':>11s} {'new ms':>11s} {'ratio':>7s} {'limit':>6s} {'p':>7s}  verdict")
+    for r in rows:
+        p = "-" if r["p"] is None else f"{r['p']:.3f}"
+        size = "-" if r["size"] is None else f"{r['size']:g}"
+        print(f"{r['case']:32s} {size:>8s} {r['base']*1e3:11.4f} {r['new']*1e3:11.4f} {r['ratio']:7.3f} "
+              f"{r['limit']:6.2f} {p:>7s}  {r['verdict']}")
+    bad = [r for r in rows if r["verdict"] == "REGRESSION"]
+    print(f"{len(bad)} regression(s) in {len(rows)} cases")
+    sys.exit(1 if bad else 0)
+
+def main():
+    p = argparse.ArgumentParser(description="Store benchmark results and check runs for regressions.")
+    p.add_argument("--store", type=Path, default=default_store(), help="JSON-lines results store")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("record", help="run a benchmark (or parse TIMING lines) and store the results")
+    r.add_argument("source", choices=["bench", "vectorize", "timing"])
+    r.add_argument("files", nargs="*", help="timing: files with TIMING lines ('-' = stdin)")
+    r.add_argument("--tag", default=None, help='label the run, e.g. "baseline"')
+    r.add_argument("--cases", nargs="+", default=None, help="bench: case names or prefixes")
+    r.add_argument("--sizes", nargs="+", type=float, default=None, help="bench: tmax values")
+    r.add_argument("--warmup", type=int, default=1)
+    r.add_argument("--repeat", type=int, default=7)
+    r.add_argument("--runs", type=int, default=5, help="vectorize: processes per script (= samples)")
+    sub.add_parser("list", help="list stored runs")
+    c = sub.add_parser("compare", help="compare a run with a baseline; exit 1 on regressions")
+    c.add_argument("--run", default=None, help="run id prefix or tag (default: latest)")
+    c.add_argument("--baseline", default=None,
+                   help='run id prefix or tag (default: latest earlier run with common cases, "baseline"-tagged first)')
+    c.add_argument("--threshold", type=float, default=0.10, help="minimum relative slowdown to flag")
+    c.add_argument("--alpha", type=float, default=0.05, help="significance level of the U test")
+    args = p.parse_args()
+    {"record": _cmd_record, "list": _cmd_list, "compare": _cmd_compare}[args.cmd](args)
+
+if __name__ == "__main__":
+    main()
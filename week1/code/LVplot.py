@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+LVplot.py — Plotting helpers shared by LV1–LV4: lazy matplotlib, decimation
+and rasterisation for long trajectories.
+
+pyplot() imports matplotlib (Agg backend) only when a figure is actually made,
+so `--no-plot` runs and library use of simulate() never pay for it.
+
+decimate() is min/max-preserving: the series is cut into about max_points/2
+buckets and each bucket keeps its minimum and maximum (in time order), so
+peaks, troughs and the visual envelope survive while a PDF of a 10^6-step run
+holds a few thousand points per line. thin() takes evenly strided indices, for
+phase-plane curves where "min/max in time" has no meaning; envelope() keeps the
+bucket-wise lower/upper bounds of a band (fill_between).
+
+With raster=True the data artists are rasterised into the otherwise vector
+PDF (at dpi), which bounds file size whatever the number of points.
+
+    python LVplot.py   # self-check of decimate()
+"""
+import numpy as np
+
+def add_args(p):
+    """Add the shared --no-plot / --max-points / --raster / --dpi options to an ArgumentParser."""
+    p.add_argument("--no-plot", action="store_true", help="skip the figure (matplotlib is never imported)")
+    p.add_argument("--max-points", type=int, default=0,
+                   help="min/max-decimate each line to about this many points (0 = all points)")
+    p.add_argument("--raster", action="store_true", help="rasterise the plotted data in the PDF")
+    p.add_argument("--dpi", type=int, default=200, help="resolution of rasterised data")
+    p.add_argument("--render-workers", type=int, default=1,
+                   help="render the figures in this many processes (see LVrender)")
+
+def pyplot():
+    import matplotlib
+    matplotlib.use("Agg")  # no GUI
+    import matplotlib.pyplot as plt
+    return plt
+
+def _buckets(n, max_points):
+    """Bucket length so that 2 points per bucket stay within max_points (0: no decimation)."""
+    if not max_points or n <= max_points:
+        return 0
+    return -(-n // max(1, max_points // 2))
+
+def decimate(x, y, max_points=0):
+    """Min/max-preserving downsampling of the line (x, y) to about max_points points."""
+    x, y = np.asarray(x), np.asarray(y)
+    b = _buckets(len(y), max_points)
+    if not b:
+        return x, y
+    m = len(y) // b * b
+    blocks = y[:m].reshape(-1, b)
+    base = np.arange(0, m, b)[:, None]
+    pair = np.sort(np.stack([blocks.argmin(axis=1), blocks.argmax(axis=1)], axis=1), axis=1) + base
+    idx = np.unique(np.concatenate([[0], pair.ravel(), np.arange(m, len(y)), [len(y) - 1]]))
+    return x[idx], y[idx]
+
+def thin(n, max_points=0):
+    """Evenly strided indices into n points (first and last included)."""
+    if not max_points or n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+
+def envelope(x, lo, hi, max_points=0):
+    """Downsample a band: bucket-wise min of lo and max of hi, at each bucket's first x."""
+    x, lo, hi = np.asarray(x), np.asarray(lo), np.asarray(hi)
+    b = _buckets(len(x), max_points)
+    if not b:
+        return x, lo, hi
+    starts = np.arange(0, len(x), b)
+    xs = np.append(x[starts], x[-1])
+    return (xs, np.append(np.minimum.reduceat(lo, starts), lo[-1]),
+            np.append(np.maximum.reduceat(hi, starts), hi[-1]))
+
+def main():
+    t = np.linspace(0.0, 100.0, 1_000_001)
+    y = np.sin(t) + 0.1*np.sin(37*t)
+    y[123457] = 5.0   # a one-step spike must survive
+    td, yd = decimate(t, y, 4000)
+    ok = len(td) <= 4002 and yd.max() == y.max() and yd.min() == y.min() and np.all(np.diff(td) > 0)
+    print(f"decimate: {len(t)} -> {len(td)} points, extremes kept: {'PASS' if ok else 'FAIL'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+LVrender.py — Render figures from plain-data specifications, in-process or in a process pool.
+
+A figure spec holds data and layout only (no matplotlib objects, so it pickles):
+
+    {"path": ".../LV2.pdf", "figsize": (7, 4), "grid": (1, 1), "dpi": "figure",
+     "axes": [[op("plot", t, R, label="R"), op("set_xlabel", "Time"), op("legend")]],
+     "figure": [op("suptitle", "...")]}
+
+Each op is an Axes method call (name, args, kwargs), one list per subplot in
+row-major order; "figure" ops are Figure method calls. transform="axes" stands
+for ax.transAxes and the pseudo-method "line_collection" adds a LineCollection
+of the given segments. line() and band() build min/max-decimated plot and
+fill_between ops (see LVplot).
+
+render(spec) draws, tight_layout()s and saves one figure and returns
+{"path", "seconds", "pid", "phases"} (its LVtiming "plot"/"save" records).
+render_all(specs, workers) renders many figures in a process pool (each worker
+imports matplotlib once) and adds the workers' phase records to the caller's
+LVtiming.RECORDS; results come back in input order and two specs may not write
+the same file, so output names are deterministic whatever the scheduling. LV1–LV4 build their figures with
+figure_spec()-style functions, so regenerating hundreds of figures is one
+render_all().
+
+    python LVrender.py --demo 200 --workers 4     # LV2 parameter sweep, per-figure times
+    python LVrender.py specs.pkl --workers 4      # spec lists saved with dump()
+"""
+import argparse, os, pickle, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import LVplot, LVtiming
+
+def op(name, *args, **kwargs):
+    return (name, args, kwargs)
+
+def line(x, y, *fmt, max_points=0, raster=False, **kw):
+    """plot op of a min/max-decimated (optionally rasterised) line."""
+    return op("plot", *LVplot.decimate(x, y, max_points), *fmt, rasterized=raster or None, **kw)
+
+def band(x, lo, hi, max_points=0, raster=False, **kw):
+    """fill_between op of a downsampled band."""
+    return op("fill_between", *LVplot.envelope(x, lo, hi, max_points), rasterized=raster or None, **kw)
+
+def _apply(target, ax, ops):
+    for name, args, kw in ops:
+        if kw.get("transform") == "axes":
+            kw = {**kw, "transform": ax.transAxes}
+        if name == "line_collection":
+            from matplotlib.collections import LineCollection
+            ax.add_collection(LineCollection(*args, **kw))
+            ax.autoscale()
+        else:
+            getattr(target, name)(*args, **kw)
+
+def render(spec):
+    """Draw and save one figure spec; return {"path", "seconds", "pid", "phases"}."""
+    t0 = time.perf_counter()
+    n0 = len(LVtiming.RECORDS)
+    with LVtiming.phase("plot"):
+        plt = LVplot.pyplot()
+        fig, axes = plt.subplots(*spec.get("grid", (1, 1)), figsize=spec.get("figsize"), squeeze=False)
+        for ax, ops in zip(axes.flat, spec.get("axes", [])):
+            _apply(ax, ax, ops)
+        _apply(fig, axes.flat[0], spec.get("figure", []))
+        if spec.get("tight_layout", True):
+            fig.tight_layout()
+    with LVtiming.phase("save"):
+        path = Path(spec["path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(path, dpi=spec.get("dpi", "figure"))
+    plt.close(fig)
+    return {"path": str(path), "seconds": time.perf_counter() - t0, "pid": os.getpid(),
+            "phases": LVtiming.RECORDS[n0:]}
+
+def render_all(specs, workers=None):
+    """Render specs (in a pool of `workers` processes if > 1); results in input order."""
+    specs = list(specs)
+    paths = [str(Path(s["path"]).resolve()) for s in specs]
+    dup = {p for p in paths if paths.count(p) > 1}
+    if dup:
+        raise ValueError(f"several specs write {sorted(dup)}")
+    workers = min(workers or os.cpu_count() or 1, len(specs))
+    if workers <= 1:
+        return [render(s) for s in specs]
+    with ProcessPoolExecutor(workers) as ex:
+        results = list(ex.map(render, specs, chunksize=max(1, len(specs) // (4 * workers))))
+    for r in results:   # recorded in the workers, so not yet in this process's RECORDS
+        LVtiming.RECORDS.extend(r["phases"])
+    return results
+
+def table(results, wall=None):
+    """Per-figure render times (and the total) as a string."""
+    width = max([len("figure")] + [len(Path(r["path"]).name) for r in results])
+    lines = [f"{'figure':<{width}} {'seconds':>9} {'pid':>8}"]
+    lines += [f"{Path(r['path']).name:<{width}} {r['seconds']:9.4f} {r['pid']:>8}" for r in results]
+    total = sum(r["seconds"] for r in results)
+    lines.append(f"{len(results)} figures, {total:.3f}s render time" + (f", {wall:.3f}s wall" if wall else ""))
+    return "\n".join(lines)
+
+def dump(specs, path):
+    with open(path, "wb") as f:
+        pickle.dump(list(specs), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def demo_specs(n, out_dir, tmax=60.0, dt=0.01, max_points=2000):
+    """Specs of n LV2 figures over a sweep of K (one broadcast simulation)."""
+    import LV2
+    K = np.linspace(20.0, 120.0, n)
+    t, R, C = LV2.simulate(K=K, tmax=tmax, dt=dt)
+    return [LV2.figure_spec(t, R[:, j], C[:, j], Path(out_dir) / f"LV2_K{j:04d}.pdf", f"K={k:.2f}",
+                            max_points=max_points) for j, k in enumerate(K)]
+
+def main():
+    p = argparse.ArgumentParser(description="Render pickled figure specs (or a demo sweep) in a process pool.")
+    p.add_argument("specs", nargs="*", help="pickle files written by LVrender.dump()")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores; 1 = in-process)")
+    p.add_argument("--demo", type=int, default=0, help="render this many LV2 figures from a K sweep")
+    p.add_argument("--out-dir", type=str, default=None, help="demo output dir; default ../results/render_demo")
+    args = p.parse_args()
+
+    specs = [s for f in args.specs for s in load(f)]
+    if args.demo:
+        out_dir = Path(args.out_dir) if args.out_dir else (Path(__file__).resolve().parents[1]/"results"/"render_demo")
+        specs += demo_specs(args.demo, out_dir)
+    if not specs:
+        p.error("nothing to render (give spec files or --demo N)")
+    t0 = time.perf_counter()
+    results = render_all(specs, args.workers)
+    print(table(results, time.perf_counter() - t0))
+    print(f"[OK] Rendered {len(results)} figures")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+LVsensitivity.py — Global sensitivity analysis (Sobol, Morris) of the LV models.
+
+Designs live in the unit hypercube and are scaled to BOUNDS. Every batch of
+design points is evaluated as ONE broadcast simulate() call (LV2, LV3) or one
+simulate_ensemble() call with per-replicate parameters (LV4), and batches are
+spread over a process pool, as in LVsweep.
+
+LV4 uses common random numbers: rows that the estimators compare (A_i, B_i and
+every AB_j,i in a Saltelli design; the points of one Morris trajectory) follow
+the same noise path, so index differences measure the parameters, not noise.
+The discrete-time maps (LV3, LV4) go extinct for almost all of the generic
+BOUNDS (a up to 1 wipes out R within a few steps, >99% of runs), so they use
+MODEL_BOUNDS (a in [0.01, 0.05], ~70% of runs persist) unless bounds= says otherwise.
+
+Outputs per design point (OUTPUTS):
+    R_final, C_final  densities at tmax
+    t_extinct         first time R or C drops below `threshold` (tmax if never)
+    R_amplitude       max - min of R over the second half of the run
+
+sobol(): Saltelli design (scrambled Sobol' points, N*(d+2) runs), first-order
+indices with the Saltelli (2010) estimator and total indices with Jansen's.
+morris(): r one-at-a-time trajectories on a p-level grid (r*(d+1) runs);
+mu* (mean |elementary effect|), mu and sigma, in unit-cube units.
+Confidence intervals are percentile bootstraps over base samples/trajectories.
+
+    python LVsensitivity.py --model LV3 --N 4096
+    python LVsensitivity.py --model LV4 --method morris --params r a z e K sigma
+"""
+import argparse, json, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+
+BOUNDS = {"r": (0.5, 2.0), "a": (0.1, 1.0), "z": (0.1, 0.5), "e": (0.5, 1.0),
+          "K": (10.0, 100.0), "sigma": (0.0, 0.1)}
+MODEL_BOUNDS = {"LV3": {"a": (0.01, 0.05)}, "LV4": {"a": (0.01, 0.05)}}
+OUTPUTS = ("R_final", "C_final", "t_extinct", "R_amplitude")
+MODELS = ("LV2", "LV3", "LV4")
+METHODS = ("sobol", "morris")
+
+def scale(U, names, bounds=None):
+    """Map unit-cube points U (n, d) to parameter values."""
+    bounds = {**BOUNDS, **(bounds or {})}
+    lo = np.array([bounds[k][0] for k in names]); hi = np.array([bounds[k][1] for k in names])
+    return lo + U * (hi - lo)
+
+def outputs(t, R, C, threshold=1e-6):
+    """OUTPUTS of trajectories R, C of shape (n_time, B)."""
+    dead = (R < threshold) | (C < threshold)
+    first = dead.argmax(axis=0)
+    tail = R[len(t) // 2:]
+    return {"R_final": R[-1], "C_final": C[-1],
+            "t_extinct": np.where(dead.any(axis=0), t[first], t[-1]).astype(float),
+            "R_amplitude": tail.max(axis=0) - tail.min(axis=0)}
+
+def evaluate(model, X, names, seed=0, threshold=1e-6, streams=None, n_streams=None, **fixed):
+    """Run one batch (rows of X = parameter values for names); return {output: (B,)}.
+
+    LV4 rows with equal streams entries share their noise (see LV4.stream_ensemble)."""
+    kw = {k: X[:, i] for i, k in enumerate(names)}
+    if model == "LV4":
+        import LV4
+        t, R, C = LV4.simulate_ensemble(**kw, **fixed, seed=seed, replicates=len(X),
+                                        streams=streams, n_streams=n_streams)
+        return outputs(t, R.T, C.T, threshold)
+    if "sigma" in kw:
+        raise ValueError(f"{model} has no sigma; only LV4 is stochastic")
+    import LV2, LV3
+    t, R, C = (LV2 if model == "LV2" else LV3).simulate(**kw, **fixed)
+    return outputs(t, R, C, threshold)
+
+def _evaluate_chunk(args):
+    model, X, names, seed, threshold, streams, n_streams, fixed = args
+    return evaluate(model, X, names, seed, threshold, streams, n_streams, **fixed)
+
+def run(model, X, names, batch=2048, workers=None, seed=1234, threshold=1e-6, streams=None, n_streams=None,
+        **fixed):
+    """Evaluate all rows of X in batches over a process pool; return {output: (n,)}.
+
+    Without streams every LV4 row gets independent noise; with streams (one int per
+    row, < n_streams) rows with the same entry share it across batches."""
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+    jobs = [(model, X[i:i+batch], names, [seed, bi] if streams is None else seed, threshold,
+             None if streams is None else streams[i:i+batch], n_streams, fixed)
+            for bi, i in enumerate(range(0, len(X), batch))]
+    if workers == 1 or len(jobs) == 1:
+        parts = [_evaluate_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_evaluate_chunk, jobs))
+    return {k: np.concatenate([p[k] for p in parts]) for k in OUTPUTS}
+
+# ---------------------------- Sobol / Saltelli ----------------------------
+
+def saltelli_design(N, d, seed=1234):
+    """Unit-cube Saltelli design [A; B; AB_1 .. AB_d] of shape (N*(d+2), d); N a power of 2."""
+    from scipy.stats import qmc
+    m = int(np.log2(N))
+    if 2**m != N:
+        raise ValueError(f"N must be a power of 2, got {N}")
+    S = qmc.Sobol(2 * d, scramble=True, seed=seed).random_base2(m)
+    A, B = S[:, :d], S[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    AB[np.arange(d), :, np.arange(d)] = B.T
+    return np.vstack([A, B, AB.reshape(-1, d)])
+
+def _sobol_estimates(fA, fB, fAB):
+    """S1, ST for fA, fB (..., N) and fAB (..., d, N)."""
+    V = np.concatenate([fA, fB], axis=-1).var(axis=-1)[..., None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        S1 = (fB[..., None, :] * (fAB - fA[..., None, :])).mean(axis=-1) / V
+        ST = 0.5 * ((fA[..., None, :] - fAB)**2).mean(axis=-1) / V
+    return S1, ST
+
+def sobol_indices(Y, N, d, n_boot=500, conf=0.95, seed=0):
+    """First-order and total indices of Saltelli-design outputs Y, with bootstrap CIs."""
+    fA, fB, fAB = Y[:N], Y[N:2*N], Y[2*N:].reshape(d, N)
+    S1, ST = _sobol_estimates(fA, fB, fAB)
+    idx = np.random.default_rng(seed).integers(0, N, (n_boot, N))
+    bS1, bST = _sobol_estimates(fA[idx], fB[idx], fAB[:, idx].transpose(1, 0, 2))
+    q = [(1 - conf) / 2, (1 + conf) / 2]
+    return {"S1": S1, "S1_ci": np.nanquantile(bS1, q, axis=0).T,
+            "ST": ST, "ST_ci": np.nanquantile(bST, q, axis=0).T}
+
+def sobol(model, names, N=1024, n_boot=500, batch=2048, workers=None, seed=1234, bounds=None, **fixed):
+    """Sobol indices of every output; returns {output: indices} and the number of runs."""
+    d = len(names)
+    X = scale(saltelli_design(N, d, seed), names, {**MODEL_BOUNDS.get(model, {}), **(bounds or {})})
+    # common random numbers: A_i, B_i and AB_j,i all follow noise path i
+    Y = run(model, X, names, batch, workers, seed, streams=np.arange(len(X)) % N, n_streams=N, **fixed)
+    return {k: sobol_indices(Y[k], N, d, n_boot, seed=seed) for k in OUTPUTS}, len(X)
+
+# --------------------------------- Morris ---------------------------------
+
+def morris_design(r, d, levels=4, seed=1234):
+    """r one-at-a-time trajectories of d+1 unit-cube points each, shape (r*(d+1), d)."""
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+    grid = np.arange(levels) / (levels - 1)
+    X = np.empty((r, d + 1, d))
+    X[:, 0] = rng.choice(grid, (r, d))
+    step = np.where(X[:, 0] + delta <= 1.0, delta, -delta)
+    order = np.argsort(rng.random((r, d)), axis=1)
+    for j in range(d):
+        X[:, j + 1] = X[:, j]
+        k = order[:, j]
+        X[np.arange(r), j + 1, k] += step[np.arange(r), k]
+    return X.reshape(-1, d)
+
+def morris_indices(U, Y, d, n_boot=500, conf=0.95, seed=0):
+    """mu*, mu, sigma of the elementary effects along the trajectories, with a CI for mu*."""
+    U = U.reshape(-1, d + 1, d); Y = Y.reshape(-1, d + 1)
+    dU = np.diff(U, axis=1)
+    k = np.abs(dU).argmax(axis=2)
+    EE = np.empty((len(U), d))
+    EE[np.arange(len(U))[:, None], k] = np.diff(Y, axis=1) / np.take_along_axis(dU, k[..., None], 2)[..., 0]
+    idx = np.random.default_rng(seed).integers(0, len(U), (n_boot, len(U)))
+    boot = np.abs(EE)[idx].mean(axis=1)
+    q = [(1 - conf) / 2, (1 + conf) / 2]
+    return {"mu_star": np.abs(EE).mean(axis=0), "mu_star_ci": np.quantile(boot, q, axis=0).T,
+            "mu": EE.mean(axis=0), "sigma": EE.std(axis=0, ddof=1)}
+
+def morris(model, names, r=100, levels=4, n_boot=500, batch=2048, workers=None, seed=1234, bounds=None,
+           **fixed):
+    """Morris screening of every output; returns {output: indices} and the number of runs."""
+    d = len(names)
+    U = morris_design(r, d, levels, seed)
+    # common random numbers: the d+1 points of a trajectory share one noise path
+    Y = run(model, scale(U, names, {**MODEL_BOUNDS.get(model, {}), **(bounds or {})}), names, batch, workers,
+            seed, streams=np.arange(len(U)) // (d + 1), n_streams=r, **fixed)
+    return {k: morris_indices(U, Y[k], d, n_boot, seed=seed) for k in OUTPUTS}, len(U)
+
+def report(method, names, res):
+    for out, ind in res.items():
+        print(f"\n{out}")
+        if method == "sobol":
+            print(f"  {'param':6s} {'S1':>8s} {'95% CI':>18s} {'ST':>8s} {'95% CI':>18s}")
+            for i, k in enumerate(names):
+                print(f"  {k:6s} {ind['S1'][i]:8.3f} [{ind['S1_ci'][i, 0]:7.3f},{ind['S1_ci'][i, 1]:7.3f}] "
+                      f"{ind['ST'][i]:8.3f} [{ind['ST_ci'][i, 0]:7.3f},{ind['ST_ci'][i, 1]:7.3f}]")
+        else:
+            print(f"  {'param':6s} {'mu*':>10s} {'95% CI':>22s} {'mu':>10s} {'sigma':>10s}")
+            for i, k in enumerate(names):
+                print(f"  {k:6s} {ind['mu_star'][i]:10.4g} [{ind['mu_star_ci'][i, 0]:9.4g},"
+                      f"{ind['mu_star_ci'][i, 1]:9.4g}] {ind['mu'][i]:10.4g} {ind['sigma'][i]:10.4g}")
+
+def main():
+    p = argparse.ArgumentParser(description="Sobol / Morris sensitivity of LV outputs to the model parameters.")
+    p.add_argument("--model", choices=MODELS, default="LV3")
+    p.add_argument("--method", choices=METHODS, default="sobol")
+    p.add_argument("--params", nargs="+", choices=list(BOUNDS), default=None,
+                   help="parameters to vary (default r a z e K, plus sigma for LV4)")
+    p.add_argument("--N", type=int, default=1024, help="sobol: base samples (power of 2)")
+    p.add_argument("--trajectories", type=int, default=200, help="morris: number of trajectories")
+    p.add_argument("--levels", type=int, default=4, help="morris: grid levels")
+    p.add_argument("--tmax", type=float, default=None)
+    p.add_argument("--dt", type=float, default=0.05, help="LV2 Euler step")
+    p.add_argument("--boot", type=int, default=500, help="bootstrap resamples for the CIs")
+    p.add_argument("--batch", type=int, default=2048, help="design points per vectorised simulate() call")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--seed", type=int, default=1234)
+    p.add_argument("--out", type=str, default=None,
+                   help="Output JSON; default ../results/LV_sensitivity_<model>_<method>.json")
+    args = p.parse_args()
+
+    names = args.params or ["r", "a", "z", "e", "K"] + (["sigma"] if args.model == "LV4" else [])
+    fixed = {}
+    if args.tmax is not None:
+        fixed["tmax"] = args.tmax if args.model == "LV2" else int(args.tmax)
+    if args.model == "LV2":
+        fixed["dt"] = args.dt
+    out = Path(args.out) if args.out else (Path(__file__).resolve().parents[1]/"results"/
+                                           f"LV_sensitivity_{args.model}_{args.method}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    if args.method == "sobol":
+        res, n = sobol(args.model, names, args.N, args.boot, args.batch, args.workers, args.seed, **fixed)
+    else:
+        res, n = morris(args.model, names, args.trajectories, args.levels, args.boot, args.batch,
+                        args.workers, args.seed, **fixed)
+    secs = time.perf_counter() - t0
+    print(f"{args.model} {args.method}: {n} model runs in {secs:.2f}s ({n / secs:,.0f} runs/s)")
+    report(args.method, names, res)
+    out.write_text(json.dumps({"model": args.model, "method": args.method, "params": names, "runs": n,
+                               "fixed": fixed, "indices": {k: {s: np.asarray(v).tolist() for s, v in ind.items()}
+                                                           for k, ind in res.items()}}, indent=1))
+    print(f"[OK] Saved -> {out}")
+
+if __name__ == "__main__":
+    main()
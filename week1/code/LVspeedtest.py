@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """
 run_LV.py — Run & profile LV1.py (CT), LV2.py (CT+K), LV3.py (DT+K), LV4.py (DT+K+noise).
-Print wall-clock timings and cProfile summaries (top tail).
+Print in-process engine timings (LVbench: warm-up + repeats, median/IQR/min),
+then end-to-end script wall-clock (incl. interpreter start-up and imports) and
+cProfile summaries (top tail), and finally a per-phase table (import, simulate,
+plot, save) built from the LVtiming records each script writes.
+--store appends the in-process and per-phase timings to the LVperf results
+store, so `python LVperf.py compare` can check them against a baseline.
 """
-import subprocess, sys, time
+import argparse, os, subprocess, sys, tempfile, time
 from pathlib import Path
 
 HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+import LVtiming
 PY = sys.executable
 
 LV1 = HERE / "LV1.py"
@@ -18,11 +25,19 @@ COMMON_CT = ["--r","1.0","--a","0.5","--z","0.3","--e","0.75","--tmax","80","--d
 LV2_ONLY   = ["--K","50"]
 COMMON_DT = ["--r","1.0","--a","0.5","--z","0.3","--e","0.75","--tmax","80","--R0","10","--C0","5","--K","50"]
 LV4_ONLY  = ["--sigma","0.05","--seed","1"]
+NO_CACHE  = ["--no-cache"]  # time the simulation, not an LVcache hit
+
+PHASES = []  # LVtiming records collected from the timed runs
 
 def run_timed(cmd):
-    t0 = time.perf_counter()
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    dt = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        log = os.path.join(tmp, "phases.jsonl")
+        t0 = time.perf_counter()
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                           env={**os.environ, "LV_TIMING": log})
+        dt = time.perf_counter() - t0
+        if os.path.exists(log):
+            PHASES.extend(LVtiming.read(log))
     return p.returncode, dt, p.stdout.strip(), p.stderr.strip()
 
 def profile_script(script, args):
@@ -34,7 +49,7 @@ def section(title): print("\n" + title + "\n" + "="*len(title))
 
 def do_one(name, script, args):
     rc, secs, out, err = run_timed([PY, str(script), *args])
-    print(f"[{name}] rc={rc}, time={secs:.3f}s")
+    print(f"[{name}] rc={rc}, end-to-end time={secs:.3f}s")
     if out: print(f"[{name}] stdout:", out)
     if err: print(f"[{name}] stderr:", err)
     prc, prof, perr = profile_script(script, args)
@@ -43,15 +58,34 @@ def do_one(name, script, args):
     if perr: print(f"[{name} profile stderr]\n{perr}")
 
 def main():
+    p = argparse.ArgumentParser(description="Time and profile LV1-LV4.")
+    p.add_argument("--store", nargs="?", const="", default=None,
+                   help="append the timings to this LVperf store (no value: the default store)")
+    p.add_argument("--tag", default=None, help='label the stored run, e.g. "baseline"')
+    args = p.parse_args()
+
     for f in (LV1,LV2,LV3,LV4):
         if not f.exists():
             print(f"WARNING: {f.name} not found — skipping its tests.")
 
-    section("Wall-clock timing & profile")
+    import LVbench
+    section("In-process timing (simulate() only)")
+    bench = LVbench.run_suite(["LV1-odeint", "LV2-euler", "LV3", "LV4"], sizes=(80,))
+
+    section("End-to-end wall-clock & profile")
     if LV1.exists(): do_one("LV1", LV1, COMMON_CT)
-    if LV2.exists(): do_one("LV2", LV2, [*COMMON_CT, *LV2_ONLY])
-    if LV3.exists(): do_one("LV3", LV3, COMMON_DT)
-    if LV4.exists(): do_one("LV4", LV4, [*COMMON_DT, *LV4_ONLY])
+    if LV2.exists(): do_one("LV2", LV2, [*COMMON_CT, *LV2_ONLY, *NO_CACHE])
+    if LV3.exists(): do_one("LV3", LV3, [*COMMON_DT, *NO_CACHE])
+    if LV4.exists(): do_one("LV4", LV4, [*COMMON_DT, *LV4_ONLY, *NO_CACHE])
+
+    section("Per-phase wall-clock (LVtiming)")
+    print(LVtiming.table(PHASES) if PHASES else "no phase records")
+
+    if args.store is not None:
+        import LVperf
+        store = args.store or LVperf.default_store()
+        run = LVperf.append(store, LVperf.from_bench(bench) + LVperf.from_phases(PHASES), args.tag)
+        print(f"[OK] Stored run {run} -> {store}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+LVstore.py — Compact on-disk storage for LV trajectories (float32, decimation, compression).
+
+    LVstore.save("ens_store", t, R, C, params={"sigma": 0.05}, time_axis=1, every=10, fmt="chunked")
+    with LVstore.load("ens_store") as s:
+        s.meta["params"], s["R"][1000:2000]       # only the chunks holding rows 1000..1999
+
+R and C have time on time_axis: 0 for simulate() output (time, batch...),
+1 for LV4.simulate_ensemble() and LVsweep shards (trajectory, time).
+save() keeps every k-th time point (like LVstream's every=), optionally casts
+to float32, and writes a directory holding meta.json (model parameters,
+source/stored dtype, decimation, float eps of the stored precision, array
+shapes) and the arrays in one of FORMATS:
+
+  npy      one .npy per array, opened memory-mapped (no compression).
+  npz      one compressed data.npz; each array is decompressed when accessed.
+  chunked  blocks of chunk rows (axis 0), byte-shuffled (bytes of equal
+           significance stored together, as in blosc/HDF5) and compressed with
+           zstd if the zstandard package is installed, else zlib. Indexing
+           decompresses only the blocks it touches.
+
+Everything after the float32 cast and the stride is lossless. save() only
+replaces an existing directory that is itself a store (holds meta.json); any
+other non-empty path raises FileExistsError. LV1–LV4 take --store DIR
+(--store-format, --store-dtype, --store-every; see add_args) to archive the
+trajectory they simulate. Run this file to compare archive size and load time
+against float64 .npy on an LV4 ensemble.
+"""
+import argparse, json, shutil, time, zlib
+from pathlib import Path
+import numpy as np
+
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except ImportError:
+    HAVE_ZSTD = False
+
+FORMATS = ("npy", "npz", "chunked")
+DTYPES = ("float64", "float32")
+META = "meta.json"
+
+def _compress(buf, codec, level):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(buf)
+    return zlib.compress(buf, level)
+
+def _decompress(buf, codec):
+    if codec == "zstd":
+        if not HAVE_ZSTD:
+            raise ImportError("this store was written with zstd; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(buf)
+    return zlib.decompress(buf)
+
+def shuffle(a):
+    """Byte-shuffle: all first bytes, then all second bytes, ... of the values of a."""
+    a = np.ascontiguousarray(a)
+    return a.view(np.uint8).reshape(-1, a.dtype.itemsize).T.tobytes()
+
+def unshuffle(buf, dtype, shape):
+    dtype = np.dtype(dtype)
+    return np.frombuffer(buf, np.uint8).reshape(dtype.itemsize, -1).T.copy().view(dtype).reshape(shape)
+
+def save(path, t, R, C, params=None, dtype="float32", every=1, fmt="npz", time_axis=0, chunk=4096, level=3,
+         **extra):
+    """Write t, R, C (plus extra arrays, unchanged) as a store directory; return its size in bytes."""
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {DTYPES}, got {dtype!r}")
+    every = int(every)
+    if every < 1 or chunk < 1:
+        raise ValueError("every and chunk must be >= 1")
+    t, R, C = np.asarray(t), np.asarray(R), np.asarray(C)
+    if not (len(t) == R.shape[time_axis] == C.shape[time_axis]):
+        raise ValueError(f"t, R and C must have the same length along time_axis={time_axis}")
+    stride = (slice(None),) * time_axis + (slice(None, None, every),)
+    arrays = {"t": t[::every], "R": R[stride].astype(dtype, copy=False), "C": C[stride].astype(dtype, copy=False),
+              **{k: np.asarray(v) for k, v in extra.items()}}
+    codec = ("zstd" if HAVE_ZSTD else "zlib") if fmt == "chunked" else None
+
+    path = Path(path)
+    if (path / META).is_file():
+        shutil.rmtree(path)
+    elif path.exists() and (not path.is_dir() or any(path.iterdir())):
+        raise FileExistsError(f"{path} exists and is not an LVstore directory; refusing to overwrite it")
+    path.mkdir(parents=True, exist_ok=True)
+    info = {}
+    for name, a in arrays.items():
+        info[name] = {"shape": list(a.shape), "dtype": a.dtype.str}
+        if fmt == "npy":
+            np.save(path / f"{name}.npy", a)
+        elif fmt == "chunked":
+            files = []
+            for k, block in enumerate([a] if a.ndim == 0 else [a[i:i+chunk] for i in range(0, len(a), chunk)]):
+                files.append(f"{name}.{k:06d}.{codec}")
+                (path / files[-1]).write_bytes(_compress(shuffle(block), codec, level))
+            info[name].update(chunk=chunk, files=files)
+    if fmt == "npz":
+        np.savez_compressed(path / "data.npz", **arrays)
+    meta = {"format": fmt, "codec": codec, "dtype": dtype, "source_dtype": R.dtype.str,
+            "eps": float(np.finfo(dtype).eps), "every": every, "time_axis": time_axis, "n_source": len(t),
+            "params": {k: np.asarray(v).tolist() for k, v in (params or {}).items()}, "arrays": info}
+    (path / META).write_text(json.dumps(meta, indent=1))
+    return size(path)
+
+def size(path):
+    """Total bytes of the files in a store."""
+    return sum(f.stat().st_size for f in Path(path).iterdir())
+
+class Chunked:
+    """Lazy read-only view of one chunked array; indexing decompresses only the blocks it needs."""
+
+    def __init__(self, path, info, codec):
+        self.path, self.codec = Path(path), codec
+        self.shape, self.dtype = tuple(info["shape"]), np.dtype(info["dtype"])
+        self.chunk, self.files = info["chunk"], info["files"]
+        self.ndim = len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def block(self, k):
+        if self.ndim == 0:
+            return unshuffle(_decompress((self.path / self.files[0]).read_bytes(), self.codec), self.dtype, ())
+        rows = min(self.chunk, self.shape[0] - k * self.chunk)
+        buf = _decompress((self.path / self.files[k]).read_bytes(), self.codec)
+        return unshuffle(buf, self.dtype, (rows, *self.shape[1:]))
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        first, rest = key[0], key[1:]
+        if isinstance(first, (int, np.integer)):
+            i = range(self.shape[0])[first]
+            return self.block(i // self.chunk)[(i % self.chunk, *rest)]
+        if not isinstance(first, slice):
+            return np.asarray(self)[key]
+        start, stop, step = first.indices(self.shape[0])
+        rows = range(start, stop, step)
+        if len(rows) == 0:
+            return np.empty((0, *self.shape[1:]), self.dtype)[(slice(None), *rest)]
+        lo, hi = min(rows[0], rows[-1]), max(rows[0], rows[-1])
+        k0, k1 = lo // self.chunk, hi // self.chunk
+        part = np.concatenate([self.block(k) for k in range(k0, k1 + 1)])
+        off = k0 * self.chunk
+        return part[(slice(start - off, (stop - off) if stop - off >= 0 else None, step), *rest)]
+
+    def __array__(self, dtype=None, copy=None):
+        if self.ndim == 0 or not self.files:
+            out = self.block(0) if self.files else np.empty(self.shape, self.dtype)
+        else:
+            out = np.concatenate([self.block(k) for k in range(len(self.files))])
+        return out if dtype is None else out.astype(dtype)
+
+class Store:
+    """A store opened by load(): meta (dict) and lazily loaded arrays by name."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / META).read_text())
+        fmt = self.meta["format"]
+        self._npz = np.load(self.path / "data.npz") if fmt == "npz" else None
+
+    def keys(self):
+        return list(self.meta["arrays"])
+
+    def __contains__(self, name):
+        return name in self.meta["arrays"]
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        fmt = self.meta["format"]
+        if fmt == "npy":
+            return np.load(self.path / f"{name}.npy", mmap_mode="r")
+        if fmt == "npz":
+            return self._npz[name]
+        arr = Chunked(self.path, self.meta["arrays"][name], self.meta["codec"])
+        return np.asarray(arr) if arr.ndim == 0 else arr
+
+    def close(self):
+        if self._npz is not None:
+            self._npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load(path):
+    """Open a store written by save(); arrays are memory-mapped or decompressed on access."""
+    return Store(path)
+
+def add_args(p):
+    """Add the shared --store / --store-format / --store-dtype / --store-every options to an ArgumentParser."""
+    p.add_argument("--store", type=str, default=None, help="also archive the trajectory as an LVstore directory")
+    p.add_argument("--store-format", choices=FORMATS, default="npz")
+    p.add_argument("--store-dtype", choices=DTYPES, default="float32")
+    p.add_argument("--store-every", type=int, default=1, help="keep every k-th time point in the archive")
+
+def save_args(args, t, R, C, params, time_axis=0):
+    """save() with the add_args() options, if --store was given."""
+    if not args.store:
+        return
+    nbytes = save(args.store, t, R, C, params, dtype=args.store_dtype, every=args.store_every,
+                  fmt=args.store_format, time_axis=time_axis)
+    print(f"[OK] Saved {args.store_format}/{args.store_dtype} store ({nbytes/2**20:.2f} MiB) -> {args.store}")
+
+def main():
+    import LV4
+    p = argparse.ArgumentParser(description="Archive size and load time of an LV4 ensemble in each format.")
+    p.add_argument("--replicates", type=int, default=20000)
+    p.add_argument("--tmax", type=int, default=200)
+    p.add_argument("--a", type=float, default=0.02, help="attack rate (0.02: persistent noisy cycles)")
+    p.add_argument("--every", type=int, default=2)
+    p.add_argument("--chunk", type=int, default=1024, help="trajectories per compressed block")
+    p.add_argument("--out", type=str, default=None, help="Scratch directory; default ../results/LVstore_bench")
+    args = p.parse_args()
+
+    params = {"model": "LV4", "a": args.a, "tmax": args.tmax, "replicates": args.replicates, "seed": 1234}
+    t, R, C = LV4.simulate_ensemble(a=args.a, tmax=args.tmax, replicates=args.replicates, seed=1234)
+    out = Path(args.out) if args.out else (Path(__file__).resolve().parents[1]/"results"/"LVstore_bench")
+    n = R.size + C.size
+    print(f"LV4 ensemble: {args.replicates} trajectories x {len(t)} points ({n/1e6:.1f}M values, "
+          f"float64 {(R.nbytes + C.nbytes)/2**20:.1f} MiB)")
+    print(f"{'format':>8} {'dtype':>8} {'every':>5} {'MiB':>8} {'ratio':>6} {'save s':>7} {'load s':>7} "
+          f"{'1 traj ms':>9} {'max rel err':>11}")
+    base = None
+    for fmt, dtype, every in (("npy", "float64", 1), ("npz", "float64", 1), ("npy", "float32", 1),
+                              ("npz", "float32", 1), ("chunked", "float32", 1),
+                              ("npz", "float32", args.every), ("chunked", "float32", args.every)):
+        d = out / f"{fmt}_{dtype}_{every}"
+        t0 = time.perf_counter()
+        nbytes = save(d, t, R, C, params, dtype=dtype, every=every, fmt=fmt, time_axis=1, chunk=args.chunk)
+        t_save = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        with load(d) as s:   # read every value (a memmap alone reads nothing)
+            Rs, Cs = np.array(s["R"]), np.array(s["C"])
+        t_load = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        with load(d) as s:
+            np.asarray(s["R"][12345 % args.replicates])
+        t_one = time.perf_counter() - t0
+        ref = R[:, ::every]
+        err = np.max(np.abs(Rs - ref) / np.maximum(np.abs(ref), 1e-300))
+        base = base or (nbytes, t_load)
+        print(f"{fmt:>8} {dtype:>8} {every:>5} {nbytes/2**20:8.2f} {base[0]/nbytes:6.2f} {t_save:7.3f} "
+              f"{t_load:7.3f} {t_one*1e3:9.2f} {err:11.2e}")
+        shutil.rmtree(d)
+    if not any(out.iterdir()):
+        out.rmdir()
+    print(f"[OK] codec for chunked stores: {'zstd' if HAVE_ZSTD else 'zlib (zstandard not installed)'}")
+
+if __name__ == "__main__":
+    main()
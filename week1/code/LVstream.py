@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+LVstream.py — Constant-memory streaming of long LV2/LV3/LV4 runs.
+
+LV2.stream(), LV3.stream() and LV4.stream() take the usual simulate() arguments
+plus chunk (points per yielded chunk) and every (keep every k-th step), and
+yield (t, R, C) chunks. Internally the model kernel (LVjit) is run over a fixed
+step buffer, so memory is O(chunk + BLOCK) whatever tmax is. With every=1 the
+concatenated chunks equal simulate() exactly (LV4 draws its noise in the same
+order, block by block).
+
+Chunks can be written straight to a memory-mapped .npy (to_memmap) or to a
+directory of compressed .npz chunks (to_chunk_store / read_chunk_store).
+"""
+import argparse, json, time, tracemalloc
+from pathlib import Path
+import numpy as np
+
+BLOCK = 65536  # raw steps per kernel call
+
+def n_kept(n, every):
+    """Number of points stream() yields for n time points."""
+    return len(range(0, n, every))
+
+def stream(advance, R0, C0, n, t_step=1.0, chunk=65536, every=1):
+    """Generic driver. advance(R, C) fills R[1:], C[1:] from R[0], C[0]."""
+    every = int(every)
+    if every < 1 or chunk < 1:
+        raise ValueError("every and chunk must be >= 1")
+    per_block = every * max(1, BLOCK // every)
+    bufR = np.empty(per_block + 1); bufC = np.empty(per_block + 1)
+    outI = np.empty(chunk, dtype=np.int64); outR = np.empty(chunk); outC = np.empty(chunk)
+    outI[0], outR[0], outC[0] = 0, R0, C0
+    fill = 1
+    R, C = float(R0), float(C0)
+    i = 0
+    while i < n - 1:
+        m = min(per_block, n - 1 - i)
+        bufR[0], bufC[0] = R, C
+        advance(bufR[:m+1], bufC[:m+1])
+        # i is a multiple of every, so kept points sit at every, 2*every, ... in the buffer
+        idx = np.arange(every, m + 1, every)
+        pos = 0
+        while pos < len(idx):
+            if fill == chunk:
+                yield outI[:fill]*t_step, outR[:fill].copy(), outC[:fill].copy()
+                fill = 0
+            k = min(chunk - fill, len(idx) - pos)
+            sel = idx[pos:pos+k]
+            outI[fill:fill+k] = i + sel
+            outR[fill:fill+k] = bufR[sel]; outC[fill:fill+k] = bufC[sel]
+            fill += k; pos += k
+        R, C = bufR[m], bufC[m]
+        i += m
+    if fill:
+        yield outI[:fill]*t_step, outR[:fill].copy(), outC[:fill].copy()
+
+def to_memmap(chunks, path, n_points):
+    """Write streamed chunks into an (n_points, 3) [t, R, C] .npy memmap; return it."""
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n_points, 3))
+    j = 0
+    for t, R, C in chunks:
+        k = len(t)
+        out[j:j+k, 0], out[j:j+k, 1], out[j:j+k, 2] = t, R, C
+        j += k
+    out.flush()
+    return out
+
+def to_chunk_store(chunks, directory, meta=None):
+    """Write each chunk as a compressed chunk_NNNNNN.npz plus index.json; return the point count."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    index, total = [], 0
+    for k, (t, R, C) in enumerate(chunks):
+        name = f"chunk_{k:06d}.npz"
+        np.savez_compressed(directory / name, t=t, R=R, C=C)
+        index.append({"file": name, "start": total, "size": len(t)})
+        total += len(t)
+    (directory / "index.json").write_text(json.dumps({"meta": meta or {}, "chunks": index}, indent=1))
+    return total
+
+def read_chunk_store(directory):
+    """Yield (t, R, C) chunks back from a chunk store, in order."""
+    directory = Path(directory)
+    for c in json.loads((directory / "index.json").read_text())["chunks"]:
+        with np.load(directory / c["file"]) as z:
+            yield z["t"], z["R"], z["C"]
+
+def main():
+    import LV2, LV3, LV4
+    p = argparse.ArgumentParser(description="Stream a long LV run to disk in bounded memory.")
+    p.add_argument("--model", choices=["LV2", "LV3", "LV4"], default="LV2")
+    p.add_argument("--tmax", type=float, default=1e5)
+    p.add_argument("--dt", type=float, default=0.01, help="LV2 only")
+    p.add_argument("--every", type=int, default=1, help="keep every k-th step")
+    p.add_argument("--chunk", type=int, default=65536, help="points per chunk")
+    p.add_argument("--backend", choices=["python", "numba"], default="numba")
+    p.add_argument("--out", type=str, required=True,
+                   help="*.npy -> one memory-mapped [t, R, C] array; otherwise a directory of .npz chunks")
+    args = p.parse_args()
+
+    if args.model == "LV2":
+        n = int(args.tmax / args.dt) + 1
+        chunks = LV2.stream(tmax=args.tmax, dt=args.dt, chunk=args.chunk, every=args.every, backend=args.backend)
+    else:
+        n = int(args.tmax) + 1
+        mod = LV3 if args.model == "LV3" else LV4
+        chunks = mod.stream(tmax=int(args.tmax), chunk=args.chunk, every=args.every, backend=args.backend)
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    if args.out.endswith(".npy"):
+        out = to_memmap(chunks, args.out, n_kept(n, args.every))
+        last = out[-1]
+    else:
+        total = to_chunk_store(chunks, args.out, meta=vars(args))
+        *_, last = read_chunk_store(args.out)
+        last = [x[-1] for x in last]
+    secs = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    print(f"{args.model}: {n} steps -> {n_kept(n, args.every)} points in {secs:.2f}s, "
+          f"peak traced memory {peak/2**20:.1f} MiB")
+    print(f"Final pops -> R: {last[1]:.6f}, C: {last[2]:.6f} (t={last[0]:g})")
+    print(f"[OK] Saved -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+LVsummary.py — Streaming summary statistics for LV runs.
+
+Summary accumulates, per species, the final value, min, max, time average
+(mean over the kept steps), number of oscillation peaks (strict local maxima)
+and the mean peak-to-peak period, from successive (t, R, C) chunks. It keeps
+O(1) state per series, so combined with LV2/LV3/LV4.stream() a run never holds
+its trajectory in memory: LV2.summary(), LV3.summary() and LV4.summary() return
+one compact record per run.
+
+Chunks may carry extra trailing dimensions (time is axis 0): a (n, m) block of
+m parameter points yields m records at once (LVsweep keep="summary" feeds it
+the sweep's time-major state blocks as they are stepped). dumps() writes a
+single-run record as strict JSON (an undefined period is null, not NaN).
+"""
+import json, math
+import numpy as np
+
+STATS = ("final", "min", "max", "mean", "peaks", "period")
+FIELDS = tuple(f"{sp}_{st}" for sp in ("R", "C") for st in STATS)
+
+class _Series:
+    def __init__(self):
+        self.n = 0
+        self.tail_x = None   # last two values, for peaks spanning chunk boundaries
+        self.tail_t = None
+
+    def update(self, t, x):
+        t = np.asarray(t, dtype=float)
+        x = np.asarray(x, dtype=float)
+        if self.n == 0:
+            self.sum = x.sum(axis=0)
+            self.min = x.min(axis=0)
+            self.max = x.max(axis=0)
+            self.peaks = np.zeros(x.shape[1:], dtype=np.int64)
+            self.first_peak = np.full(x.shape[1:], np.nan)
+            self.last_peak = np.full(x.shape[1:], np.nan)
+            xx, tt = x, t
+        else:
+            self.sum = self.sum + x.sum(axis=0)
+            self.min = np.minimum(self.min, x.min(axis=0))
+            self.max = np.maximum(self.max, x.max(axis=0))
+            xx = np.concatenate([self.tail_x, x])
+            tt = np.concatenate([self.tail_t, t])
+        self.n += len(x)
+        if len(xx) >= 3:
+            pk = (xx[1:-1] > xx[:-2]) & (xx[1:-1] >= xx[2:])
+            cnt = pk.sum(axis=0)
+            if cnt.any():
+                shape = (-1,) + (1,) * (pk.ndim - 1)
+                ptimes = np.broadcast_to(tt[1:-1].reshape(shape), pk.shape)
+                first = np.min(ptimes, axis=0, initial=np.inf, where=pk)
+                last = np.max(ptimes, axis=0, initial=-np.inf, where=pk)
+                new = (self.peaks == 0) & (cnt > 0)
+                self.first_peak = np.where(new, first, self.first_peak)
+                self.last_peak = np.where(cnt > 0, last, self.last_peak)
+                self.peaks = self.peaks + cnt
+        self.tail_x, self.tail_t = xx[-2:], tt[-2:]
+        self.final = x[-1]
+
+    def stats(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            period = np.where(self.peaks >= 2,
+                              (self.last_peak - self.first_peak) / (self.peaks - 1), np.nan)
+        return (self.final, self.min, self.max, self.sum / self.n, self.peaks, period)
+
+class Summary:
+    """Online accumulator over (t, R, C) chunks; see record()."""
+    def __init__(self):
+        self.R, self.C = _Series(), _Series()
+        self.t_final = None
+
+    def update(self, t, R, C):
+        self.R.update(t, R)
+        self.C.update(t, C)
+        self.t_final = t[-1]
+
+    def record(self):
+        """Dict of FIELDS (+ t_final, n_points); scalars for single runs, arrays for grids."""
+        vals = dict(zip(FIELDS, (*self.R.stats(), *self.C.stats())))
+        if np.ndim(vals["R_final"]) == 0:
+            vals = {k: (int(v) if k.endswith("_peaks") else float(v)) for k, v in vals.items()}
+        return {**vals, "t_final": float(self.t_final), "n_points": self.R.n}
+
+def summarise(chunks):
+    """Consume a stream of (t, R, C) chunks and return Summary.record()."""
+    acc = Summary()
+    for t, R, C in chunks:
+        acc.update(t, R, C)
+    return acc.record()
+
+def dumps(record):
+    """JSON text of a single-run record; NaN (e.g. a period with < 2 peaks) becomes null."""
+    return json.dumps({k: None if isinstance(v, float) and math.isnan(v) else v for k, v in record.items()})
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+LVsweep.py — Sharded, resumable parameter sweeps for LV2/LV3/LV4.
+
+A design is a dict of equal-length 1-D parameter arrays (one entry per point).
+Points are split into fixed-size chunks; each chunk is run in a worker process
+with the vectorised simulate() (LV2/LV3) or simulate_ensemble() (LV4) and written
+straight to its own .npy shard; keep="final" and keep="summary" only advance the
+(m,) state vectors block by block (LV2/LV3 step(), LV4.stream_ensemble()), never
+the (n_time, m) history, and "summary" feeds each block to LVsummary.Summary.
+LV2 with a solve_ivp method (fixed method="RK45", ...) is scalar-only, so those
+chunks are integrated one point at a time. manifest.json records finished chunks, so
+re-running the same sweep into the same directory skips them.
+
+Shard layout: chunk_000000.npy with shape (m, 2) for keep="final" (R, C at tmax),
+(m, 2, n_time) for keep="full", or (m, len(LVsummary.FIELDS)) for keep="summary"
+(columns listed in the manifest). dtype="float32" halves the shards and, for
+keep="full", every=k keeps every k-th time point (n_time = ceil(n / k)); both
+are recorded in the manifest. See LVstore for compressed archives.
+"""
+import argparse, inspect, json, os, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+import LVsummary
+
+MODELS = ("LV2", "LV3", "LV4")
+KEEP = ("final", "full", "summary")
+DTYPES = ("float64", "float32")
+BLOCK = 256   # time steps held per block when keep="final"/"summary"
+
+def grid_design(axes):
+    """Flatten the outer product of named 1-D axes into a point design."""
+    mesh = np.meshgrid(*(np.asarray(v, dtype=float) for v in axes.values()), indexing="ij")
+    return {k: m.ravel() for k, m in zip(axes, mesh)}
+
+def _simulate_chunk(model, params, fixed, ci):
+    if model == "LV4":
+        import LV4
+        m = len(next(iter(params.values())))
+        seed = [fixed.pop("seed", 1234), ci]
+        t, R, C = LV4.simulate_ensemble(**fixed, **params, seed=seed, replicates=m)
+        return t, R, C
+    mod = __import__(model)
+    if fixed.get("method", "euler") != "euler":
+        t, R, C = _ivp_chunk(mod, params, fixed)
+    else:
+        t, R, C = mod.simulate(**fixed, **params)
+    return t, R.T, C.T   # (m, n_time)
+
+def _ivp_chunk(mod, params, fixed):
+    """solve_ivp is scalar-only: integrate each point of the chunk in turn; (n_time, m) like simulate()."""
+    m = len(next(iter(params.values())))
+    runs = [mod.simulate(**fixed, **{k: v[j] for k, v in params.items()}) for j in range(m)]
+    return runs[0][0], np.stack([R for _, R, _ in runs], axis=1), np.stack([C for _, _, C in runs], axis=1)
+
+def _stream_chunk(model, params, fixed, ci, block=BLOCK):
+    """Yield time-major (t, R, C) blocks of shape (steps, m), advancing only the state vectors."""
+    m = len(next(iter(params.values())))
+    if model == "LV4":
+        import LV4
+        seed = [fixed.pop("seed", 1234), ci]
+        yield from LV4.stream_ensemble(**fixed, **params, seed=seed, replicates=m, block=block)
+        return
+    mod = __import__(model)
+    kw = {k: v.default for k, v in inspect.signature(mod.simulate).parameters.items()}
+    kw.update(fixed, **params)
+    if kw.get("method", "euler") != "euler":   # no step() for solve_ivp: one point at a time
+        yield _ivp_chunk(mod, params, fixed)
+        return
+    pars = [kw[k] for k in ("r", "a", "z", "e", "K")] + ([kw["dt"]] if model == "LV2" else [])
+    n = int(kw["tmax"] / kw["dt"]) + 1 if model == "LV2" else int(kw["tmax"]) + 1
+    t = np.linspace(0.0, kw["tmax"], n) if model == "LV2" else np.arange(n)
+    R = np.zeros(m); C = np.zeros(m)
+    R[:], C[:] = kw["R0"], kw["C0"]
+    yield t[:1], R[None], C[None]
+    for i0 in range(1, n, block):
+        bR = np.empty((min(block, n - i0), m)); bC = np.empty_like(bR)
+        for s in range(len(bR)):
+            R, C = mod.step(R, C, *pars)
+            bR[s], bC[s] = R, C
+        yield t[i0:i0+len(bR)], bR, bC
+
+def _run_chunk(model, params, fixed, keep, ci, path, dtype="float64", every=1):
+    t0 = time.perf_counter()
+    m = len(next(iter(params.values())))
+    if keep == "final":
+        for t, R, C in _stream_chunk(model, params, dict(fixed), ci):
+            pass   # R, C: the last block
+        shape = (m, 2)
+    elif keep == "summary":
+        rec = LVsummary.summarise(_stream_chunk(model, params, dict(fixed), ci))
+        shape = (m, len(LVsummary.FIELDS))
+    else:
+        t, R, C = _simulate_chunk(model, params, dict(fixed), ci)
+        shape = (m, 2, len(range(0, R.shape[1], every)))
+    tmp = path.with_suffix(".tmp.npy")
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=shape)
+    if keep == "final":
+        out[:, 0], out[:, 1] = R[-1], C[-1]
+    elif keep == "full":
+        out[:, 0], out[:, 1] = R[:, ::every], C[:, ::every]
+    else:
+        for j, f in enumerate(LVsummary.FIELDS):
+            out[:, j] = rec[f]
+    out.flush(); del out
+    os.replace(tmp, path)
+    return ci, time.perf_counter() - t0
+
+def _write_manifest(out_dir, manifest):
+    tmp = out_dir / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1))
+    os.replace(tmp, out_dir / "manifest.json")
+
+def run_sweep(model, design, out_dir, chunk=10000, workers=None, keep="final", dtype="float64", every=1, **fixed):
+    """Run (or resume) a sweep; return the manifest dict."""
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+    if keep not in KEEP:
+        raise ValueError(f"keep must be one of {KEEP}, got {keep!r}")
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {DTYPES}, got {dtype!r}")
+    if int(every) < 1:
+        raise ValueError("every must be >= 1")
+    design = {k: np.asarray(v, dtype=float) for k, v in design.items()}
+    n_points = len(next(iter(design.values())))
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    header = {"model": model, "keep": keep, "chunk": chunk, "n_points": n_points,
+              "params": list(design), "fixed": fixed, "dtype": dtype, "every": int(every)}
+    mpath = out_dir / "manifest.json"
+    if mpath.exists():
+        manifest = json.loads(mpath.read_text())
+        old = {k: manifest.get(k, {"dtype": "float64", "every": 1}.get(k)) for k in header}
+        if old != json.loads(json.dumps(header)):
+            raise ValueError(f"{out_dir} holds a different sweep: {old}")
+        saved = np.load(out_dir / "design.npz")
+        if any(not np.array_equal(saved[k], v) for k, v in design.items()):
+            raise ValueError(f"{out_dir} holds a sweep with a different design")
+    else:
+        np.savez(out_dir / "design.npz", **design)
+        manifest = {**header, "done": {}}
+        if keep == "summary":
+            manifest["columns"] = list(LVsummary.FIELDS)
+        _write_manifest(out_dir, manifest)
+
+    n_chunks = -(-n_points // chunk)
+    todo = [ci for ci in range(n_chunks) if str(ci) not in manifest["done"]]
+    print(f"[{model}] {n_points} points in {n_chunks} chunks; {n_chunks - len(todo)} already done")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futs = []
+        for ci in todo:
+            sl = slice(ci*chunk, min((ci+1)*chunk, n_points))
+            params = {k: v[sl] for k, v in design.items()}
+            futs.append(pool.submit(_run_chunk, model, params, fixed, keep, ci,
+                                    out_dir / f"chunk_{ci:06d}.npy", dtype, int(every)))
+        for f in as_completed(futs):
+            ci, secs = f.result()
+            manifest["done"][str(ci)] = round(secs, 4)
+            _write_manifest(out_dir, manifest)
+            print(f"  chunk {ci} done in {secs:.3f}s ({len(manifest['done'])}/{n_chunks})")
+    return manifest
+
+def iter_chunks(out_dir):
+    """Yield (slice, memory-mapped array) for each finished chunk, in point order."""
+    out_dir = Path(out_dir)
+    manifest = json.loads((out_dir / "manifest.json").read_text())
+    chunk, n_points = manifest["chunk"], manifest["n_points"]
+    for ci in sorted(int(c) for c in manifest["done"]):
+        sl = slice(ci*chunk, min((ci+1)*chunk, n_points))
+        yield sl, np.load(out_dir / f"chunk_{ci:06d}.npy", mmap_mode="r")
+
+def main():
+    p = argparse.ArgumentParser(description="Resumable process-pool (r, K) sweep for LV2/LV3/LV4.")
+    p.add_argument("--model", choices=MODELS, default="LV3")
+    p.add_argument("--n", type=int, default=200, help="grid points per axis (n*n points)")
+    p.add_argument("--tmax", type=float, default=80)
+    p.add_argument("--chunk", type=int, default=5000)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--keep", choices=KEEP, default="final")
+    p.add_argument("--dtype", choices=DTYPES, default="float64", help="shard precision")
+    p.add_argument("--every", type=int, default=1, help='keep="full": keep every k-th time point')
+    p.add_argument("--out", type=str, default=None,
+                   help="Output directory; default ../results/sweep_<model>")
+    args = p.parse_args()
+
+    out = Path(args.out) if args.out else (Path(__file__).resolve().parents[1]/"results"/f"sweep_{args.model}")
+    design = grid_design({"r": np.linspace(0.5, 2.0, args.n), "K": np.linspace(10.0, 100.0, args.n)})
+    tmax = args.tmax if args.model == "LV2" else int(args.tmax)
+    t0 = time.perf_counter()
+    run_sweep(args.model, design, out, chunk=args.chunk, workers=args.workers, keep=args.keep,
+              dtype=args.dtype, every=args.every, tmax=tmax)
+    print(f"[OK] Sweep -> {out} ({time.perf_counter() - t0:.2f}s)")
+
+if __name__ == "__main__":
+    main()
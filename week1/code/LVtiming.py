@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+LVtiming.py — Lightweight phase timing for the LV scripts.
+
+    import LVtiming
+    with LVtiming.phase("import"):
+        import numpy as np
+    with LVtiming.phase("simulate"):
+        t, R, C = simulate(...)
+
+    @LVtiming.timed("plot")
+    def make_figure(...): ...
+
+Every phase appends a record {"script", "phase", "seconds"[, "peak_mib"]} to
+RECORDS; a phase entered twice gives two records (aggregate() sums them).
+Recording costs a couple of perf_counter() calls, so it is always on. With
+$LV_TIMING set the records are written at exit as JSON lines to that file
+(appended), or to stderr as "PHASE {...}" lines for LV_TIMING=-.
+LV_TIMING_MEM=1 also starts tracemalloc and records each phase's peak traced
+memory above what was allocated when it began (slower; an enclosing phase's
+peak is reset by the phases nested in it).
+
+LVspeedtest runs the scripts with $LV_TIMING set and aggregates the records
+into a per-phase table (aggregate / table below).
+"""
+import atexit, json, os, sys, time, tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+SCRIPT = Path(sys.argv[0]).stem or "python"
+RECORDS = []
+
+@contextmanager
+def phase(name):
+    """Time the body of a with-block as one record of phase `name`."""
+    mem = tracemalloc.is_tracing()
+    if mem:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        rec = {"script": SCRIPT, "phase": name, "seconds": time.perf_counter() - t0}
+        if mem:
+            rec["peak_mib"] = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+        RECORDS.append(rec)
+
+def timed(name=None):
+    """Decorator: record every call of the function as phase `name` (default: its name)."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name or fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def write(dest=None):
+    """Write RECORDS as JSON lines to dest (default $LV_TIMING; '-' = stderr)."""
+    dest = dest or os.environ.get("LV_TIMING")
+    if not dest or not RECORDS:
+        return
+    if dest == "-":
+        for rec in RECORDS:
+            print("PHASE " + json.dumps(rec), file=sys.stderr)
+    else:
+        with open(dest, "a") as f:
+            f.writelines(json.dumps(rec) + "\n" for rec in RECORDS)
+
+def read(path):
+    """Records from a JSON-lines file written by write()."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def aggregate(records):
+    """{script: {phase: {"seconds": total, "peak_mib": max}}}, phases in first-seen order."""
+    out = {}
+    for rec in records:
+        agg = out.setdefault(rec["script"], {}).setdefault(rec["phase"], {"seconds": 0.0})
+        agg["seconds"] += rec["seconds"]
+        if "peak_mib" in rec:
+            agg["peak_mib"] = max(agg.get("peak_mib", 0.0), rec["peak_mib"])
+    return out
+
+def table(records):
+    """Per-phase table (seconds; peak MiB in brackets when recorded) as a string."""
+    agg = aggregate(records)
+    phases = list(dict.fromkeys(ph for per in agg.values() for ph in per))
+    width = max([len("script")] + [len(s) for s in agg])
+    lines = [f"{'script':<{width}}" + "".join(f"{ph:>20}" for ph in phases) + f"{'total':>12}"]
+    for script, per in agg.items():
+        row = f"{script:<{width}}"
+        for ph in phases:
+            if ph not in per:
+                row += f"{'-':>20}"
+                continue
+            cell = f"{per[ph]['seconds']:.4f}s"
+            if "peak_mib" in per[ph]:
+                cell += f" [{per[ph]['peak_mib']:.1f}M]"
+            row += f"{cell:>20}"
+        lines.append(row + f"{sum(v['seconds'] for v in per.values()):>11.4f}s")
+    return "\n".join(lines)
+
+if os.environ.get("LV_TIMING_MEM") and not tracemalloc.is_tracing():
+    tracemalloc.start()
+if os.environ.get("LV_TIMING"):
+    atexit.register(write)
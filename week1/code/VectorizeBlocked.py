@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+VectorizeBlocked.py — blocked (out-of-core) dot product and L2 norm for arrays
+that do not fit in RAM, e.g. np.memmap / np.load(..., mmap_mode="r") on disk.
+
+The inputs are streamed in blocks of BLOCK elements (8 MiB of float64: large
+enough for fast BLAS calls and disk readahead, small enough that memory stays
+bounded); each block is reduced with np.dot in float64 and the block partials
+are combined pairwise (cascade summation, O(log n) state), so the rounding
+error grows like log(n_blocks) rather than n_blocks.
+
+Run this file to extend the Vectorize1/Vectorize2 benchmarks to disk-backed
+arrays. The default stops at N = 10^7 (two 80 MB files in the temp dir);
+--max-exp 8 writes 1.6 GB and --max-exp 9 16 GB (pick the disk with --dir),
+which is where the arrays outgrow RAM. It prints
+greppable lines, with throughput, against in-RAM NumPy while that fits:
+
+    TIMING Vectorize1 vect N=<n> ms=<ms> GBps=<GB/s>      # product_vect, arrays in RAM
+    TIMING Vectorize1 blocked N=<n> ms=<ms> GBps=<GB/s>   # dot() on the memmaps
+"""
+import argparse, math, os, shutil, tempfile, time
+from pathlib import Path
+import numpy as np
+
+BLOCK = 1 << 20  # elements per block
+
+def pairwise_sum(values):
+    """Sum an iterable by combining equal-sized partial sums pairwise (binary-counter cascade)."""
+    stack = []  # (number of values, partial sum), sizes strictly decreasing
+    for v in values:
+        n, s = 1, v
+        while stack and stack[-1][0] == n:
+            m, p = stack.pop()
+            n, s = n + m, p + s
+        stack.append((n, s))
+    total = 0.0
+    for _, s in reversed(stack):  # smallest partials first
+        total += s
+    return total
+
+def reduce(kernel, *arrays, block=BLOCK):
+    """pairwise_sum of kernel(*blocks) over aligned blocks of the 1-D arrays."""
+    n = len(arrays[0])
+    if any(len(a) != n for a in arrays):
+        raise ValueError("arrays must have the same length")
+    return pairwise_sum(kernel(*(a[i:i+block] for a in arrays)) for i in range(0, n, block))
+
+def _f64(x):
+    return x if x.dtype == np.float64 else x.astype(np.float64)
+
+def dot(a, b, block=BLOCK):
+    """sum(a * b), blockwise."""
+    return reduce(lambda x, y: float(np.dot(_f64(x), _f64(y))), a, b, block=block)
+
+def sumsq(a, block=BLOCK):
+    return reduce(lambda x: float(np.dot(_f64(x), _f64(x))), a, block=block)
+
+def l2(a, block=BLOCK):
+    """sqrt(sum(a * a)), blockwise."""
+    return math.sqrt(sumsq(a, block))
+
+def _fill(path, n, seed, block=BLOCK):
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n,))
+    rng = np.random.default_rng(seed)
+    for i in range(0, n, block):
+        out[i:i+block] = rng.random(min(block, n - i))
+    out.flush()
+    return np.load(path, mmap_mode="r")
+
+def _available_ram():
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+def _line(script, mode, n, ms, nbytes):
+    print(f"TIMING {script} {mode} N={n} ms={ms:.4f} GBps={nbytes / (ms * 1e6):.3f}", flush=True)
+
+def main():
+    from Vectorize1 import bench_once, product_vect
+    from Vectorize2 import l2_vect
+    p = argparse.ArgumentParser(description="Blocked dot/L2 on memory-mapped arrays vs in-RAM NumPy.")
+    p.add_argument("--min-exp", type=int, default=6)
+    p.add_argument("--max-exp", type=int, default=7,
+                   help="largest N = 10^max_exp; writes 2 x 8*N bytes (8: 1.6 GB, 9: 16 GB)")
+    p.add_argument("--block", type=int, default=BLOCK, help="elements per block")
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--dir", type=str, default=None, help="where to put the memmap files (default: a temp dir)")
+    args = p.parse_args()
+
+    n_max = 10**args.max_exp
+    work = Path(args.dir or tempfile.mkdtemp(prefix="vectorize_blocked_"))
+    work.mkdir(parents=True, exist_ok=True)
+    need = 2 * 8 * n_max
+    if shutil.disk_usage(work).free < need * 1.05:
+        raise SystemExit(f"need {need/1e9:.1f} GB free in {work}")
+    try:
+        t0 = time.perf_counter()
+        a = _fill(work / "a.npy", n_max, 42)
+        b = _fill(work / "b.npy", n_max, 43)
+        print(f"# wrote 2 x {n_max} float64 to {work} in {time.perf_counter() - t0:.1f}s; "
+              f"block={args.block}; in-RAM NumPy only where both copies fit", flush=True)
+        for k in range(args.min_exp, args.max_exp + 1):
+            N = 10**k
+            av, bv = a[:N], b[:N]
+            if 3 * 8 * N < _available_ram():
+                ar, br = np.array(av), np.array(bv)
+                _line("Vectorize1", "vect", N, bench_once(product_vect, ar, br, repeats=args.repeats), 16 * N)
+                _line("Vectorize2", "vect", N, bench_once(l2_vect, ar, repeats=args.repeats), 8 * N)
+                ref = (product_vect(ar, br), l2_vect(ar))
+                del ar, br
+            else:
+                ref = None
+            _line("Vectorize1", "blocked", N, bench_once(dot, av, bv, args.block, repeats=args.repeats), 16 * N)
+            _line("Vectorize2", "blocked", N, bench_once(l2, av, args.block, repeats=args.repeats), 8 * N)
+            if ref:
+                err = max(abs(dot(av, bv, args.block) / ref[0] - 1), abs(l2(av, args.block) / ref[1] - 1))
+                print(f"# N={N}: max relative difference blocked vs in-RAM {err:.1e}", flush=True)
+    finally:
+        if not args.dir:
+            shutil.rmtree(work, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
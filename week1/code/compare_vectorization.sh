@@ -14,6 +14,10 @@ R_VEC2="${HERE}/Vectorize2.R"
 echo "== Running Python Vectorize1/2 =="
 $PY "$P_VEC1" | tee /tmp/py_vec1.out
 $PY "$P_VEC2" | tee /tmp/py_vec2.out
+# LV_PERF_RECORD=1: also append the Python timings to the LVperf results store
+if [ -n "${LV_PERF_RECORD:-}" ]; then
+  $PY "${HERE}/LVperf.py" record timing /tmp/py_vec1.out /tmp/py_vec2.out
+fi
 
 echo
 echo "== Running R Vectorize1/2 =="
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the week1 scripts import each other as siblings (they are run from week1/code)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "code"))
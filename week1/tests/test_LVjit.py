@@ -0,0 +1,63 @@
+"""Equivalence of the LVjit kernels, LVstream and the NumPy/Python simulate() paths."""
+import numpy as np
+import pytest
+
+import LV2, LV3, LV4, LVjit
+
+CASES = [
+    (LV2.simulate, dict(tmax=80.0, dt=0.005)),
+    (LV2.simulate, dict(r=2.0, K=20.0, tmax=40.0, dt=0.05)),
+    (LV2.simulate, dict(K=20.0, tmax=2000.0, events=True)),
+    (LV3.simulate, dict(tmax=80)),
+    (LV3.simulate, dict(r=2.7, K=30.0, tmax=500)),
+    (LV3.simulate, dict(a=2.0, tmax=200, events=True)),
+    (LV4.simulate, dict(tmax=80, seed=1)),
+    (LV4.simulate, dict(tmax=300, sigma=0.3, both=True, seed=7)),
+    (LV4.simulate, dict(a=0.05, tmax=300, seed=7, events=True, bound=60.0)),
+]
+
+def _same(ref, got):
+    assert len(ref) == len(got)
+    for x, y in zip(ref, got):
+        if isinstance(x, LVjit.Event):
+            assert x == y
+        else:
+            np.testing.assert_array_equal(x, y)
+
+@pytest.mark.parametrize("sim, kw", CASES)
+def test_numba_matches_python(sim, kw):
+    pytest.importorskip("numba")
+    _same(sim(**kw), sim(**kw, backend="numba"))
+
+@pytest.mark.parametrize("backend", LVjit.BACKENDS)
+@pytest.mark.parametrize("mod, kw", [(LV2, dict(tmax=30.0, dt=0.01)), (LV3, dict(r=2.7, K=30.0, tmax=3000)),
+                                     (LV4, dict(tmax=3000, sigma=0.2, both=True, seed=3))])
+@pytest.mark.parametrize("every", [1, 7])
+def test_stream_matches_simulate(mod, kw, backend, every):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    t, R, C = mod.simulate(**kw)
+    chunks = list(mod.stream(**kw, backend=backend, chunk=100, every=every))
+    np.testing.assert_allclose(np.concatenate([c[0] for c in chunks]), t[::every], rtol=1e-12)
+    np.testing.assert_array_equal(np.concatenate([c[1] for c in chunks]), R[::every])
+    np.testing.assert_array_equal(np.concatenate([c[2] for c in chunks]), C[::every])
+
+@pytest.mark.parametrize("rn, cn, kind", [(0.0, 1.0, "prey_extinct"), (1.0, 0.0, "predator_extinct"),
+                                          (2e6, 1.0, "bound"), (1.0 + 1e-12, 1.0, "equilibrium"),
+                                          (1.5, 1.0, "tmax")])
+def test_event_codes(rn, cn, kind):
+    code = LVjit.event_code(1.0, 1.0, rn, cn, 1.0, 1e-8, 1e6)
+    assert LVjit.EVENTS[code] == kind
+    assert LVjit.event_codes(np.array([1.0]), np.array([1.0]), np.array([rn]), np.array([cn]),
+                             1.0, 1e-8, 1e6)[0] == code
+
+@pytest.mark.parametrize("mod, kw", [(LV2, dict(K=20.0, tmax=300.0, dt=0.05)), (LV3, dict(K=30.0, tmax=500))])
+def test_grid_events_match_scalar(mod, kw):
+    r, a = np.array([[0.3], [1.0], [2.7]]), np.array([0.01, 0.1, 0.5, 2.0])
+    t, R, C, ev = mod.simulate(r=r, a=a, events=True, bound=60.0, **kw)
+    assert len(set(ev.kind.ravel())) >= 3
+    for j in np.ndindex(ev.kind.shape):
+        ts, Rs, Cs, es = mod.simulate(r=r[j[0], 0], a=a[j[1]], events=True, bound=60.0, **kw)
+        assert ev.kind[j] == es.kind and ev.step[j] == es.step
+        np.testing.assert_array_equal(R[(slice(0, es.step + 1), *j)], Rs)
+        np.testing.assert_array_equal(C[(slice(0, es.step + 1), *j)], Cs)